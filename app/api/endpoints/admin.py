@@ -6,6 +6,8 @@ from app.core.authorization import (
     requires_admin, requires_manage_roles
 )
 from app.core.security import bearer_scheme
+from app.api.responses import PydanticResponse
+from app.core import permission_cache
 from app.core.dependencies import get_mongodb_repo
 from app.repository.role import RoleRepository, PermissionRepository, UserRoleRepository
 from app.repository.user import UserRepository
@@ -109,10 +111,10 @@ def list_permissions(
         for perm in permissions_data
     ]
     
-    return ListPermissionsResponse(
+    return PydanticResponse(ListPermissionsResponse(
         permissions=permissions,
         meta={"total": total}
-    )
+    ))
 
 
 @router.patch(
@@ -140,6 +142,7 @@ def update_permission(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Permission not found"
         )
+    permission_cache.invalidate_all()
     
     return Permission(
         permission_id=str(updated_permission.id),
@@ -170,6 +173,7 @@ def delete_permission(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Permission not found"
         )
+    permission_cache.invalidate_all()
     
     return {"message": f"Permission {permission_id} deleted successfully"}
 
@@ -301,10 +305,10 @@ def list_roles(
             created_at=role.created_at
         ))
     
-    return ListRolesResponse(
+    return PydanticResponse(ListRolesResponse(
         roles=roles,
         meta={"total": total}
-    )
+    ))
 
 
 @router.post(
@@ -345,6 +349,8 @@ def assign_permissions_to_role(
     for permission_id in assign_req.permission_ids:
         if role_repo.add_permission_to_role(MONGO_COLLECTION_ROLES, role_id, permission_id):
             success_count += 1
+    if success_count:
+        permission_cache.invalidate_all()
     
     return {
         "message": f"Successfully assigned {success_count} permissions to role '{role.name}'",
@@ -379,6 +385,8 @@ def remove_permissions_from_role(
     for permission_id in remove_req.permission_ids:
         if role_repo.remove_permission_from_role(MONGO_COLLECTION_ROLES, role_id, permission_id):
             success_count += 1
+    if success_count:
+        permission_cache.invalidate_all()
     
     return {
         "message": f"Successfully removed {success_count} permissions from role '{role.name}'",
@@ -446,6 +454,7 @@ def assign_role_to_user(
         MONGO_COLLECTION_USER_ROLES,
         user_role
     )
+    permission_cache.invalidate(assign_req.user_id)
     
     return RoleAssignmentResponse(
         message=f"Successfully assigned role '{role.name}' to user '{user.username}'",
@@ -497,6 +506,7 @@ def remove_role_from_user(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"User does not have role '{role.name}'"
         )
+    permission_cache.invalidate(remove_req.user_id)
     
     return {
         "message": f"Successfully removed role '{role.name}' from user '{user.username}'",
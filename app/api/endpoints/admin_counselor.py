@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from app.core.authorization import AuthorizationService, get_current_user
 from app.core.database import mongo_db
 from app.model.user import UserDB
+from app.repository.base import projection_for
 from app.repository.counselor import CounselorRepository, LeadRepository, NotificationRepository
 from app.schema.counselor import CounselorProfileResponse, PerformanceStats
 from pydantic import BaseModel, Field
@@ -14,6 +15,9 @@ logger = logging.getLogger(__name__)
 # Create router
 router = APIRouter()
 
+# Only the fields CounselorProfileResponse reads, so list queries skip the rest of each profile
+COUNSELOR_PROFILE_PROJECTION = projection_for(CounselorProfileResponse)
+
 # Lazy initialization functions
 def get_counselor_repo():
     if mongo_db.client is None:
@@ -87,7 +91,7 @@ class BulkNotification(BaseModel):
 
 # Admin Counselor Management Endpoints
 @router.get("/counselors", response_model=List[CounselorProfileResponse])
-async def get_all_counselors(
+def get_all_counselors(
     status_filter: Optional[str] = Query(None, alias="status"),
     availability_filter: Optional[bool] = Query(None, alias="available"),
     page: int = Query(1, ge=1),
@@ -105,7 +109,9 @@ async def get_all_counselors(
         
         # Get counselors with pagination
         skip = (page - 1) * limit
-        counselors = counselor_repo.database["counselor_profiles"].find(query).skip(skip).limit(limit)
+        counselors = counselor_repo.database["counselor_profiles"].find(
+            query, COUNSELOR_PROFILE_PROJECTION
+        ).skip(skip).limit(limit)
         
         counselor_list = []
         for counselor in counselors:
@@ -122,7 +128,7 @@ async def get_all_counselors(
 
 
 @router.get("/counselors/{counselor_id}", response_model=CounselorProfileResponse)
-async def get_counselor_details(
+def get_counselor_details(
     counselor_id: str,
     current_user: UserDB = Depends(get_admin_user)
 ):
@@ -149,7 +155,7 @@ async def get_counselor_details(
 
 
 @router.put("/counselors/{counselor_id}/status")
-async def update_counselor_status(
+def update_counselor_status(
     counselor_id: str,
     status_update: CounselorStatusUpdate,
     current_user: UserDB = Depends(get_admin_user)
@@ -214,7 +220,7 @@ async def update_counselor_status(
 
 
 @router.put("/counselors/{counselor_id}/performance")
-async def update_counselor_performance(
+def update_counselor_performance(
     counselor_id: str,
     performance_update: PerformanceUpdate,
     current_user: UserDB = Depends(get_admin_user)
@@ -280,7 +286,7 @@ async def update_counselor_performance(
 
 
 @router.post("/leads/{lead_id}/reassign")
-async def admin_reassign_lead(
+def admin_reassign_lead(
     lead_id: str,
     assignment: CounselorAssignment,
     current_user: UserDB = Depends(get_admin_user)
@@ -324,22 +330,6 @@ async def admin_reassign_lead(
                 detail="Failed to reassign lead"
             )
         
-        # Update counselor lead counts
-        if current_counselor_id:
-            # Decrease previous counselor's count
-            current_counselor = counselor_repo.get_counselor_by_id("counselor_profiles", current_counselor_id)
-            if current_counselor:
-                new_count = max(0, current_counselor.get("current_leads_count", 0) - 1)
-                counselor_repo.update_profile("counselor_profiles", current_counselor.get("user_id"), {
-                    "current_leads_count": new_count
-                })
-        
-        # Increase new counselor's count
-        new_count = new_counselor.get("current_leads_count", 0) + 1
-        counselor_repo.update_profile("counselor_profiles", new_counselor.get("user_id"), {
-            "current_leads_count": new_count
-        })
-        
         # Create notifications
         notifications = [
             {
@@ -385,8 +375,28 @@ async def admin_reassign_lead(
         )
 
 
+@router.post("/leads/status-counters/rebuild")
+def rebuild_lead_status_counters(
+    current_user: UserDB = Depends(get_admin_user),
+    lead_repo: LeadRepository = Depends(get_lead_repo)
+):
+    """Recompute every counselor's lead status counters from their leads (Admin only)"""
+    try:
+        lead_repo.rebuild_status_counters("leads")
+        return {
+            "message": "Lead status counters rebuilt successfully",
+            "rebuilt_by": str(current_user.id)
+        }
+    except Exception as e:
+        logger.error(f"Error rebuilding lead status counters: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
 @router.post("/notifications/broadcast")
-async def send_bulk_notification(
+def send_bulk_notification(
     notification: BulkNotification,
     current_user: UserDB = Depends(get_admin_user)
 ):
@@ -394,17 +404,15 @@ async def send_bulk_notification(
     try:
         admin_user_id = str(current_user.id)
         
-        # Get target counselors
+        # Get target counselors; only the IDs are needed to address the notifications
         if notification.counselor_ids:
             # Send to specific counselors
-            target_counselors = []
-            for counselor_id in notification.counselor_ids:
-                counselor = counselor_repo.get_counselor_by_id("counselor_profiles", counselor_id)
-                if counselor:
-                    target_counselors.append(counselor)
+            target_counselors = counselor_repo.get_counselors_by_ids(
+                "counselor_profiles", notification.counselor_ids, {"_id": 1}
+            )
         else:
             # Send to all active counselors
-            target_counselors = counselor_repo.database["counselor_profiles"].find({"status": "active"})
+            target_counselors = counselor_repo.database["counselor_profiles"].find({"status": "active"}, {"_id": 1})
             target_counselors = list(target_counselors)
         
         if not target_counselors:
@@ -413,8 +421,9 @@ async def send_bulk_notification(
                 detail="No target counselors found"
             )
         
-        # Create notifications
-        notifications_created = 0
+        # Notifications are written behind: "notifications_sent" counts queued inserts, and a
+        # failed bulk write or a crash before the next flush can still drop them
+        notifications_queued = 0
         for counselor in target_counselors:
             notification_data = {
                 "counselor_id": counselor.get("_id"),
@@ -428,11 +437,11 @@ async def send_bulk_notification(
             
             result = notification_repo.create_notification("notifications", notification_data)
             if result:
-                notifications_created += 1
+                notifications_queued += 1
         
         return {
             "message": f"Bulk notification sent successfully",
-            "notifications_sent": notifications_created,
+            "notifications_sent": notifications_queued,
             "target_counselors": len(target_counselors),
             "sent_by": admin_user_id
         }
@@ -448,27 +457,20 @@ async def send_bulk_notification(
 
 
 @router.get("/analytics/overview")
-async def get_counselor_analytics_overview(current_user: UserDB = Depends(get_admin_user)):
+def get_counselor_analytics_overview(current_user: UserDB = Depends(get_admin_user)):
     """Get overall counselor system analytics (Admin only)"""
     try:
-        # Get counselor statistics
-        total_counselors = counselor_repo.database["counselor_profiles"].count_documents({})
-        active_counselors = counselor_repo.database["counselor_profiles"].count_documents({"status": "active"})
-        available_counselors = counselor_repo.database["counselor_profiles"].count_documents({
-            "status": "active", 
-            "is_available": True
-        })
-        blocked_counselors = counselor_repo.database["counselor_profiles"].count_documents({"status": "blocked"})
-        
-        # Get lead statistics
-        total_leads = lead_repo.database["leads"].count_documents({})
-        assigned_leads = lead_repo.database["leads"].count_documents({"assigned_counselor_id": {"$exists": True, "$ne": None}})
-        unassigned_leads = total_leads - assigned_leads
-        
-        # Get performance statistics
+        # Get counselor and performance statistics in a single pass over the profiles
+        is_active = {"$eq": ["$status", "active"]}
         pipeline = [
             {"$group": {
                 "_id": None,
+                "total_counselors": {"$sum": 1},
+                "active_counselors": {"$sum": {"$cond": [is_active, 1, 0]}},
+                "available_counselors": {"$sum": {"$cond": [
+                    {"$and": [is_active, {"$eq": ["$is_available", True]}]}, 1, 0
+                ]}},
+                "blocked_counselors": {"$sum": {"$cond": [{"$eq": ["$status", "blocked"]}, 1, 0]}},
                 "total_calls": {"$sum": "$performance_metrics.total_calls_made"},
                 "total_conversions": {"$sum": "$performance_metrics.leads_converted"},
                 "avg_conversion_rate": {"$avg": "$performance_metrics.conversion_rate"}
@@ -477,6 +479,15 @@ async def get_counselor_analytics_overview(current_user: UserDB = Depends(get_ad
         
         performance_stats = list(counselor_repo.database["counselor_profiles"].aggregate(pipeline))
         perf_data = performance_stats[0] if performance_stats else {}
+        total_counselors = perf_data.get("total_counselors", 0)
+        active_counselors = perf_data.get("active_counselors", 0)
+        available_counselors = perf_data.get("available_counselors", 0)
+        blocked_counselors = perf_data.get("blocked_counselors", 0)
+        
+        # Get lead statistics
+        total_leads = lead_repo.database["leads"].estimated_document_count()
+        assigned_leads = lead_repo.database["leads"].count_documents({"assigned_counselor_id": {"$exists": True, "$ne": None}})
+        unassigned_leads = total_leads - assigned_leads
         
         return {
             "counselor_overview": {
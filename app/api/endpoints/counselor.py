@@ -4,6 +4,7 @@ from datetime import datetime
 from app.core.authorization import AuthorizationService, get_current_user
 from app.core.database import mongo_db
 from app.model.user import UserDB
+from app.repository.base import projection_for
 from app.repository.counselor import CounselorRepository, LeadRepository, NotificationRepository
 from app.model.counselor import CounselorProfileDB
 from app.schema.counselor import (
@@ -18,6 +19,8 @@ logger = logging.getLogger(__name__)
 # Create router
 router = APIRouter()
 
+NOTIFICATION_PROJECTION = projection_for(NotificationResponse)
+
 # Lazy initialization functions
 def get_counselor_repo():
     if mongo_db.client is None:
@@ -69,7 +72,7 @@ async def get_counselor_user(
 
 
 @router.get("/profile", response_model=CounselorProfileResponse)
-async def get_counselor_profile(
+def get_counselor_profile(
     current_user: UserDB = Depends(get_counselor_user),
     counselor_repo: CounselorRepository = Depends(get_counselor_repo)
 ):
@@ -99,7 +102,7 @@ async def get_counselor_profile(
 
 
 @router.put("/profile", response_model=CounselorProfileResponse)
-async def update_counselor_profile(
+def update_counselor_profile(
     profile_update: CounselorProfileUpdate,
     current_user: UserDB = Depends(get_counselor_user),
     counselor_repo: CounselorRepository = Depends(get_counselor_repo)
@@ -156,7 +159,7 @@ async def update_counselor_profile(
 
 
 @router.put("/profile/working-hours")
-async def update_working_hours(
+def update_working_hours(
     working_hours_update: WorkingHoursUpdate,
     current_user: UserDB = Depends(get_counselor_user),
     counselor_repo: CounselorRepository = Depends(get_counselor_repo)
@@ -192,7 +195,7 @@ async def update_working_hours(
 
 
 @router.put("/profile/notifications")
-async def update_notification_preferences(
+def update_notification_preferences(
     notification_prefs: NotificationPreferencesUpdate,
     current_user: UserDB = Depends(get_counselor_user),
     counselor_repo: CounselorRepository = Depends(get_counselor_repo)
@@ -230,7 +233,7 @@ async def update_notification_preferences(
 
 
 @router.get("/profile/status")
-async def get_counselor_status(
+def get_counselor_status(
     current_user: UserDB = Depends(get_counselor_user),
     counselor_repo: CounselorRepository = Depends(get_counselor_repo)
 ):
@@ -266,7 +269,7 @@ async def get_counselor_status(
 
 
 @router.put("/profile/availability")
-async def toggle_availability(
+def toggle_availability(
     current_user: UserDB = Depends(get_counselor_user),
     counselor_repo: CounselorRepository = Depends(get_counselor_repo)
 ):
@@ -316,7 +319,7 @@ async def toggle_availability(
 
 # Dashboard Endpoints
 @router.get("/dashboard/stats", response_model=DashboardStats)
-async def get_dashboard_stats(
+def get_dashboard_stats(
     current_user: UserDB = Depends(get_counselor_user),
     counselor_repo: CounselorRepository = Depends(get_counselor_repo),
     lead_repo: LeadRepository = Depends(get_lead_repo)
@@ -352,7 +355,7 @@ async def get_dashboard_stats(
 
 
 @router.get("/dashboard/performance", response_model=PerformanceStats)
-async def get_performance_stats(
+def get_performance_stats(
     current_user: UserDB = Depends(get_counselor_user),
     counselor_repo: CounselorRepository = Depends(get_counselor_repo)
 ):
@@ -407,7 +410,7 @@ async def get_performance_stats(
 
 
 @router.get("/notifications", response_model=List[NotificationResponse])
-async def get_notifications(
+def get_notifications(
     unread_only: bool = False,
     current_user: UserDB = Depends(get_counselor_user),
     counselor_repo: CounselorRepository = Depends(get_counselor_repo),
@@ -430,7 +433,7 @@ async def get_notifications(
         
         # Get notifications
         notifications = notification_repo.get_notifications_by_counselor(
-            "notifications", counselor_id, unread_only
+            "notifications", counselor_id, unread_only, projection=NOTIFICATION_PROJECTION
         )
         
         return [NotificationResponse(**notification) for notification in notifications]
@@ -446,7 +449,7 @@ async def get_notifications(
 
 
 @router.put("/notifications/{notification_id}/read")
-async def mark_notification_read(
+def mark_notification_read(
     notification_id: str,
     current_user: UserDB = Depends(get_counselor_user),
     notification_repo: NotificationRepository = Depends(get_notification_repo)
@@ -474,7 +477,7 @@ async def mark_notification_read(
 
 
 @router.get("/notifications/unread-count")
-async def get_unread_notifications_count(
+def get_unread_notifications_count(
     current_user: UserDB = Depends(get_counselor_user),
     counselor_repo: CounselorRepository = Depends(get_counselor_repo),
     notification_repo: NotificationRepository = Depends(get_notification_repo)
@@ -4,6 +4,7 @@ from datetime import datetime
 from app.core.authorization import AuthorizationService, get_current_user
 from app.core.database import mongo_db
 from app.model.user import UserDB
+from app.repository.base import projection_for
 from app.repository.counselor import CounselorRepository, LeadRepository, CallLogRepository, MessageLogRepository
 from app.schema.counselor import (
     CallLogCreate, CallLogResponse, MessageLogCreate, MessageLogResponse
@@ -15,6 +16,10 @@ logger = logging.getLogger(__name__)
 # Create router
 router = APIRouter()
 
+CALL_LOG_PROJECTION = projection_for(CallLogResponse)
+# Only the fields the call statistics are computed from
+CALL_STATS_PROJECTION = {"duration_minutes": 1, "outcome": 1}
+
 # Lazy initialization functions
 def get_counselor_repo():
     if mongo_db.client is None:
@@ -70,7 +75,7 @@ async def get_counselor_user(
     return current_user
 
 
-async def get_counselor_id_from_user(user_id: str) -> str:
+def get_counselor_id_from_user(user_id: str) -> str:
     """Get counselor ID from user ID"""
     profile = counselor_repo.get_profile_by_user_id("counselor_profiles", user_id)
     if not profile:
@@ -81,7 +86,7 @@ async def get_counselor_id_from_user(user_id: str) -> str:
     return profile.get("_id")
 
 
-async def verify_lead_access(lead_id: str, counselor_id: str) -> Dict[str, Any]:
+def verify_lead_access(lead_id: str, counselor_id: str) -> Dict[str, Any]:
     """Verify that counselor has access to the lead"""
     lead = lead_repo.get_lead_by_id("leads", lead_id)
     
@@ -102,7 +107,7 @@ async def verify_lead_access(lead_id: str, counselor_id: str) -> Dict[str, Any]:
 
 # Call Log Endpoints
 @router.post("/{lead_id}/call-log", response_model=CallLogResponse)
-async def create_call_log(
+def create_call_log(
     lead_id: str,
     call_log_data: CallLogCreate,
     current_user: UserDB = Depends(get_counselor_user)
@@ -110,10 +115,10 @@ async def create_call_log(
     """Log a call made to a lead"""
     try:
         user_id = str(current_user.id)
-        counselor_id = await get_counselor_id_from_user(user_id)
+        counselor_id = get_counselor_id_from_user(user_id)
         
         # Verify lead access
-        lead = await verify_lead_access(lead_id, counselor_id)
+        lead = verify_lead_access(lead_id, counselor_id)
         
         # Create call log entry
         call_data = call_log_data.model_dump()
@@ -125,28 +130,11 @@ async def create_call_log(
         
         call_log = call_log_repo.create_call_log("call_logs", call_data)
         
-        if not call_log:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to create call log"
-            )
-        
         # Update lead's last contact date
         lead_repo.update_lead_status("leads", lead_id, lead.get("status"), counselor_id)
         
         # Update counselor performance metrics
-        profile = counselor_repo.get_profile_by_user_id("counselor_profiles", user_id)
-        if profile:
-            metrics = profile.get("performance_metrics", {})
-            metrics["total_calls_made"] = metrics.get("total_calls_made", 0) + 1
-            
-            # Update average call duration
-            total_calls = metrics["total_calls_made"]
-            current_avg = metrics.get("average_call_duration", 0)
-            new_avg = ((current_avg * (total_calls - 1)) + call_log_data.duration_minutes) / total_calls
-            metrics["average_call_duration"] = round(new_avg, 2)
-            
-            counselor_repo.update_performance_metrics("counselor_profiles", counselor_id, metrics)
+        counselor_repo.record_call_metrics("counselor_profiles", counselor_id, call_log_data.duration_minutes)
         
         return CallLogResponse(**call_log)
         
@@ -161,20 +149,20 @@ async def create_call_log(
 
 
 @router.get("/{lead_id}/call-logs", response_model=List[CallLogResponse])
-async def get_lead_call_logs(
+def get_lead_call_logs(
     lead_id: str,
     current_user: UserDB = Depends(get_counselor_user)
 ):
     """Get all call logs for a specific lead"""
     try:
         user_id = str(current_user.id)
-        counselor_id = await get_counselor_id_from_user(user_id)
+        counselor_id = get_counselor_id_from_user(user_id)
         
         # Verify lead access
-        await verify_lead_access(lead_id, counselor_id)
+        verify_lead_access(lead_id, counselor_id)
         
         # Get call logs
-        call_logs = call_log_repo.get_call_logs_by_lead("call_logs", lead_id)
+        call_logs = call_log_repo.get_call_logs_by_lead("call_logs", lead_id, projection=CALL_LOG_PROJECTION)
         
         return [CallLogResponse(**log) for log in call_logs]
         
@@ -190,7 +178,7 @@ async def get_lead_call_logs(
 
 # Message Log Endpoints
 @router.post("/{lead_id}/send-message", response_model=MessageLogResponse)
-async def send_message_to_lead(
+def send_message_to_lead(
     lead_id: str,
     message_data: MessageLogCreate,
     current_user: UserDB = Depends(get_counselor_user)
@@ -198,10 +186,10 @@ async def send_message_to_lead(
     """Send message to a lead (email/SMS/WhatsApp)"""
     try:
         user_id = str(current_user.id)
-        counselor_id = await get_counselor_id_from_user(user_id)
+        counselor_id = get_counselor_id_from_user(user_id)
         
         # Verify lead access
-        lead = await verify_lead_access(lead_id, counselor_id)
+        lead = verify_lead_access(lead_id, counselor_id)
         
         # Create message log entry
         message_log_data = message_data.model_dump()
@@ -220,12 +208,6 @@ async def send_message_to_lead(
         
         message_log = message_log_repo.create_message_log("message_logs", message_log_data)
         
-        if not message_log:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to create message log"
-            )
-        
         # Update lead's last contact date
         lead_repo.update_lead_status("leads", lead_id, lead.get("status"), counselor_id)
         
@@ -245,17 +227,17 @@ async def send_message_to_lead(
 
 
 @router.get("/{lead_id}/messages", response_model=List[MessageLogResponse])
-async def get_lead_messages(
+def get_lead_messages(
     lead_id: str,
     current_user: UserDB = Depends(get_counselor_user)
 ):
     """Get all messages sent to a specific lead"""
     try:
         user_id = str(current_user.id)
-        counselor_id = await get_counselor_id_from_user(user_id)
+        counselor_id = get_counselor_id_from_user(user_id)
         
         # Verify lead access
-        await verify_lead_access(lead_id, counselor_id)
+        verify_lead_access(lead_id, counselor_id)
         
         # Get message logs
         message_logs = message_log_repo.get_message_logs_by_lead("message_logs", lead_id)
@@ -273,7 +255,7 @@ async def get_lead_messages(
 
 
 @router.put("/messages/{message_id}/read")
-async def mark_message_as_read(
+def mark_message_as_read(
     message_id: str,
     current_user: UserDB = Depends(get_counselor_user)
 ):
@@ -301,20 +283,20 @@ async def mark_message_as_read(
 
 # Communication History Endpoints
 @router.get("/{lead_id}/communication-history")
-async def get_communication_history(
+def get_communication_history(
     lead_id: str,
     current_user: UserDB = Depends(get_counselor_user)
 ):
     """Get complete communication history for a lead (calls + messages)"""
     try:
         user_id = str(current_user.id)
-        counselor_id = await get_counselor_id_from_user(user_id)
+        counselor_id = get_counselor_id_from_user(user_id)
         
         # Verify lead access
-        await verify_lead_access(lead_id, counselor_id)
+        verify_lead_access(lead_id, counselor_id)
         
         # Get call logs and message logs
-        call_logs = call_log_repo.get_call_logs_by_lead("call_logs", lead_id)
+        call_logs = call_log_repo.get_call_logs_by_lead("call_logs", lead_id, projection=CALL_LOG_PROJECTION)
         message_logs = message_log_repo.get_message_logs_by_lead("message_logs", lead_id)
         
         # Combine and sort by date
@@ -355,7 +337,7 @@ async def get_communication_history(
 
 # Counselor Communication Statistics
 @router.get("/stats/communication")
-async def get_communication_stats(
+def get_communication_stats(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     current_user: UserDB = Depends(get_counselor_user)
@@ -363,26 +345,28 @@ async def get_communication_stats(
     """Get communication statistics for counselor"""
     try:
         user_id = str(current_user.id)
-        counselor_id = await get_counselor_id_from_user(user_id)
+        counselor_id = get_counselor_id_from_user(user_id)
         
         # Parse dates if provided
         start_dt = datetime.fromisoformat(start_date) if start_date else None
         end_dt = datetime.fromisoformat(end_date) if end_date else None
         
-        # Get call logs
-        call_logs = call_log_repo.get_call_logs_by_counselor("call_logs", counselor_id, start_dt, end_dt)
-        
-        # Calculate call statistics
-        total_calls = len(call_logs)
-        total_duration = sum(log.get("duration_minutes", 0) for log in call_logs)
-        avg_duration = total_duration / total_calls if total_calls > 0 else 0
+        # Stream call logs, accumulating totals and outcome counts in one pass
+        call_logs = call_log_repo.iter_call_logs_by_counselor(
+            "call_logs", counselor_id, start_dt, end_dt, projection=CALL_STATS_PROJECTION
+        )
         
-        # Count outcomes
+        total_calls = 0
+        total_duration = 0
         outcomes = {}
         for log in call_logs:
+            total_calls += 1
+            total_duration += log.get("duration_minutes", 0)
             outcome = log.get("outcome")
             outcomes[outcome] = outcomes.get(outcome, 0) + 1
         
+        avg_duration = total_duration / total_calls if total_calls > 0 else 0
+        
         return {
             "period": {
                 "start_date": start_date,
@@ -4,6 +4,7 @@ from datetime import datetime
 from app.core.authorization import AuthorizationService, get_current_user
 from app.core.database import mongo_db
 from app.model.user import UserDB
+from app.repository.base import projection_for
 from app.repository.counselor import CounselorRepository, LeadRepository
 from app.schema.counselor import (
     LeadResponse, LeadSearchFilters, LeadStatusUpdate, LeadQualityUpdate,
@@ -16,6 +17,8 @@ logger = logging.getLogger(__name__)
 # Create router
 router = APIRouter()
 
+LEAD_PROJECTION = projection_for(LeadResponse)
+
 # Lazy initialization functions
 def get_counselor_repo():
     if mongo_db.client is None:
@@ -61,7 +64,7 @@ async def get_counselor_user(
     return current_user
 
 
-async def get_counselor_id_from_user(user_id: str) -> str:
+def get_counselor_id_from_user(user_id: str) -> str:
     """Get counselor ID from user ID"""
     profile = counselor_repo.get_profile_by_user_id("counselor_profiles", user_id)
     if not profile:
@@ -73,7 +76,7 @@ async def get_counselor_id_from_user(user_id: str) -> str:
 
 
 @router.get("", response_model=Dict[str, Any])
-async def get_leads(
+def get_leads(
     status_filter: Optional[str] = Query(None, alias="status"),
     quality_filter: Optional[str] = Query(None, alias="quality"),
     priority_filter: Optional[str] = Query(None, alias="priority"),
@@ -90,7 +93,7 @@ async def get_leads(
     """Get leads assigned to counselor with filtering and pagination"""
     try:
         user_id = str(current_user.id)
-        counselor_id = await get_counselor_id_from_user(user_id)
+        counselor_id = get_counselor_id_from_user(user_id)
         
         # Build filters
         filters = {}
@@ -110,7 +113,7 @@ async def get_leads(
             filters["date_to"] = date_to
         
         # Search leads
-        result = lead_repo.search_leads("leads", counselor_id, filters, page, limit)
+        result = lead_repo.search_leads("leads", counselor_id, filters, page, limit, projection=LEAD_PROJECTION)
         
         # Convert leads to response format
         leads = [LeadResponse(**lead) for lead in result["leads"]]
@@ -136,14 +139,14 @@ async def get_leads(
 
 
 @router.get("/{lead_id}", response_model=LeadResponse)
-async def get_lead_details(
+def get_lead_details(
     lead_id: str,
     current_user: UserDB = Depends(get_counselor_user)
 ):
     """Get detailed information about a specific lead"""
     try:
         user_id = str(current_user.id)
-        counselor_id = await get_counselor_id_from_user(user_id)
+        counselor_id = get_counselor_id_from_user(user_id)
         
         # Get lead
         lead = lead_repo.get_lead_by_id("leads", lead_id)
@@ -174,7 +177,7 @@ async def get_lead_details(
 
 
 @router.put("/{lead_id}/status", response_model=LeadResponse)
-async def update_lead_status(
+def update_lead_status(
     lead_id: str,
     status_update: LeadStatusUpdate,
     current_user: UserDB = Depends(get_counselor_user)
@@ -182,7 +185,7 @@ async def update_lead_status(
     """Update lead status"""
     try:
         user_id = str(current_user.id)
-        counselor_id = await get_counselor_id_from_user(user_id)
+        counselor_id = get_counselor_id_from_user(user_id)
         
         # Update lead status
         updated_lead = lead_repo.update_lead_status("leads", lead_id, status_update.status, counselor_id)
@@ -206,7 +209,7 @@ async def update_lead_status(
 
 
 @router.put("/{lead_id}/quality", response_model=LeadResponse)
-async def mark_lead_quality(
+def mark_lead_quality(
     lead_id: str,
     quality_update: LeadQualityUpdate,
     current_user: UserDB = Depends(get_counselor_user)
@@ -214,7 +217,7 @@ async def mark_lead_quality(
     """Mark lead quality (good/bad/future)"""
     try:
         user_id = str(current_user.id)
-        counselor_id = await get_counselor_id_from_user(user_id)
+        counselor_id = get_counselor_id_from_user(user_id)
         
         # Mark lead quality
         updated_lead = lead_repo.mark_lead_quality("leads", lead_id, quality_update.quality, counselor_id)
@@ -238,7 +241,7 @@ async def mark_lead_quality(
 
 
 @router.put("/{lead_id}/reassign", response_model=LeadResponse)
-async def reassign_lead(
+def reassign_lead(
     lead_id: str,
     reassignment: LeadReassignment,
     current_user: UserDB = Depends(get_counselor_user)
@@ -246,7 +249,7 @@ async def reassign_lead(
     """Reassign lead to another counselor"""
     try:
         user_id = str(current_user.id)
-        counselor_id = await get_counselor_id_from_user(user_id)
+        counselor_id = get_counselor_id_from_user(user_id)
         
         # Check if new counselor exists and is available
         new_counselor = counselor_repo.get_counselor_by_id("counselor_profiles", reassignment.new_counselor_id)
@@ -282,19 +285,6 @@ async def reassign_lead(
                 detail="Lead not found or not assigned to you"
             )
         
-        # Update counselor lead counts
-        # Decrease current counselor's count
-        counselor_repo.update_profile("counselor_profiles", user_id, {
-            "$inc": {"current_leads_count": -1}
-        })
-        
-        # Increase new counselor's count  
-        new_counselor_profile = counselor_repo.get_profile_by_user_id("counselor_profiles", new_counselor.get("user_id"))
-        if new_counselor_profile:
-            counselor_repo.update_profile("counselor_profiles", new_counselor.get("user_id"), {
-                "$inc": {"current_leads_count": 1}
-            })
-        
         return LeadResponse(**updated_lead)
         
     except HTTPException:
@@ -308,7 +298,7 @@ async def reassign_lead(
 
 
 @router.post("/{lead_id}/notes")
-async def add_lead_note(
+def add_lead_note(
     lead_id: str,
     note: LeadNote,
     current_user: UserDB = Depends(get_counselor_user)
@@ -316,7 +306,7 @@ async def add_lead_note(
     """Add note to lead"""
     try:
         user_id = str(current_user.id)
-        counselor_id = await get_counselor_id_from_user(user_id)
+        counselor_id = get_counselor_id_from_user(user_id)
         
         # Add note to lead
         success = lead_repo.add_note_to_lead("leads", lead_id, note.note, counselor_id)
@@ -340,7 +330,7 @@ async def add_lead_note(
 
 
 @router.put("/{lead_id}/follow-up")
-async def schedule_follow_up(
+def schedule_follow_up(
     lead_id: str,
     follow_up: FollowUpSchedule,
     current_user: UserDB = Depends(get_counselor_user)
@@ -348,7 +338,7 @@ async def schedule_follow_up(
     """Schedule follow-up for lead"""
     try:
         user_id = str(current_user.id)
-        counselor_id = await get_counselor_id_from_user(user_id)
+        counselor_id = get_counselor_id_from_user(user_id)
         
         # Validate follow-up date is in the future
         if follow_up.follow_up_date <= datetime.utcnow():
@@ -382,11 +372,11 @@ async def schedule_follow_up(
 
 
 @router.get("/summary/stats")
-async def get_lead_summary_stats(current_user: UserDB = Depends(get_counselor_user)):
+def get_lead_summary_stats(current_user: UserDB = Depends(get_counselor_user)):
     """Get summary statistics for counselor's leads"""
     try:
         user_id = str(current_user.id)
-        counselor_id = await get_counselor_id_from_user(user_id)
+        counselor_id = get_counselor_id_from_user(user_id)
         
         # Get dashboard stats (reuse existing method)
         stats = lead_repo.get_dashboard_stats("leads", counselor_id)
@@ -1,14 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.security import HTTPBearer
+from starlette.concurrency import run_in_threadpool
 from typing import Dict, Any, Optional, List
 from datetime import datetime, date
 import logging
 from pydantic import BaseModel, Field
 
-from app.core.dependencies import get_user_dep, get_mongodb_repo
+from app.core.dependencies import get_user_dep, get_user_with_profile_dep, get_mongodb_repo
 from app.core.authorization import (
     get_current_user, requires_manage_profile, requires_any_role,
-    AuthorizationService, get_authorization_service
+    AuthContext, get_auth_context,
+    ROLE_ADMIN, ROLE_STUDENT, PERM_MANAGE_PROFILE
 )
 from app.repository.user import UserRepository
 from app.repository.student import StudentRepository
@@ -18,32 +20,52 @@ from app.model.user import UserDB
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
+# Profile shape returned when the student has not created a profile yet
+_EMPTY_PROFILE_TEMPLATE = {
+    "profile_completed": False,
+    "completion_percentage": 0,
+    "interests": [],
+    "career_goals": None,
+    "current_education_level": None,
+    "qualifications": [],
+    "college_preferences": [],
+    "personal_details": None,
+    "contact_details": None,
+    "address_details": None
+}
+
+# Static dashboard payloads shown until the profile is at least 90% complete
+_NOTIFS_INCOMPLETE = (
+    {"message": "Complete your profile to unlock all features", "type": "info", "priority": "medium"},
+)
+_RECS_INCOMPLETE = (
+    {"title": "Complete Profile", "description": "Add missing information to improve visibility", "action": "complete_profile"},
+    {"title": "Upload Documents", "description": "Upload required certificates and transcripts", "action": "upload_docs"},
+)
+
 # Student authorization dependency - allows students, admins, and users with manage_profile permission
 requires_student_access = requires_any_role(["student", "admin", "user"])
 
-def get_student_user(
-    current_user: UserDB = Depends(get_current_user),
-    auth_service: AuthorizationService = Depends(get_authorization_service)
+async def get_student_user(
+    auth_context: AuthContext = Depends(get_auth_context)
 ) -> UserDB:
     """
     Get current user and check if they have student access.
     Allows: students, admins, or users with manage_profile permission
     """
-    # Admin users can access everything
-    if auth_service.user_has_role(str(current_user.id), "admin"):
-        return current_user
-    
-    # Users with student role can access
-    if auth_service.user_has_role(str(current_user.id), "student"):
-        return current_user
+    roles_mask, perms_mask = auth_context.access_masks()
+
+    # Admin and student users can access
+    if roles_mask & (ROLE_ADMIN | ROLE_STUDENT):
+        return auth_context.user
     
     # Users with manage_profile permission can access
-    if auth_service.user_has_permission(str(current_user.id), "manage_profile"):
-        return current_user
+    if perms_mask & PERM_MANAGE_PROFILE:
+        return auth_context.user
     
     # Check what roles/permissions the user actually has for better error message
-    user_roles = auth_service.get_user_roles(str(current_user.id))
-    user_permissions = auth_service.get_user_permissions(str(current_user.id))
+    user_roles = list(auth_context.roles)
+    user_permissions = list(auth_context.permissions)
     
     error_detail = f"Student access denied. Required: 'student' role OR 'manage_profile' permission. " \
                   f"Your roles: {user_roles}. Your permissions: {user_permissions}"
@@ -152,6 +174,9 @@ class CollegePreferenceResponse(BaseModel):
     data: Dict[str, Any]
     message: str
 
+# Shared so FastAPI's per-request dependency cache sees a single callable
+_student_repo_dep = get_mongodb_repo(StudentRepository)
+
 router = APIRouter(
     prefix="/student",
     dependencies=[Depends(security)]
@@ -161,40 +186,28 @@ router = APIRouter(
 @router.get("/profile", response_model=StudentProfileResponse)
 async def get_student_profile(
     current_user: UserDB = Depends(get_student_user),
-    student_repo: StudentRepository = Depends(get_mongodb_repo(StudentRepository))
+    student_repo: StudentRepository = Depends(_student_repo_dep)
 ):
     """Get current student's profile"""
     try:
         # Try to get existing profile
-        profile = student_repo.get_profile_by_user_id(str(current_user.id))
+        profile = await student_repo.load_profile_by_user_id(str(current_user.id))
         
         if profile:
-            return StudentProfileResponse(
-                success=True,
-                data=profile,
-                message="Profile retrieved successfully"
-            )
+            return {
+                "success": True,
+                "data": profile,
+                "message": "Profile retrieved successfully"
+            }
         else:
             # Return empty profile structure
-            return StudentProfileResponse(
-                success=True,
-                data={
-                    "user_id": str(current_user.id),
-                    "profile_completed": False,
-                    "completion_percentage": 0,
-                    "interests": [],
-                    "career_goals": None,
-                    "current_education_level": None,
-                    "qualifications": [],
-                    "college_preferences": [],
-                    "personal_details": None,
-                    "contact_details": None,
-                    "address_details": None
-                },
-                message="No profile found, please create one"
-            )
+            return {
+                "success": True,
+                "data": {"user_id": str(current_user.id), **_EMPTY_PROFILE_TEMPLATE},
+                "message": "No profile found, please create one"
+            }
     except Exception as e:
-        logger.error(f"Error getting student profile: {str(e)}")
+        logger.error("Error getting student profile: %s", e)
         raise HTTPException(status_code=500, detail="Failed to retrieve profile")
 
 
@@ -202,12 +215,12 @@ async def get_student_profile(
 async def create_student_profile(
     profile_data: CreateStudentProfileRequest,
     current_user: UserDB = Depends(get_student_user),
-    student_repo: StudentRepository = Depends(get_mongodb_repo(StudentRepository))
+    student_repo: StudentRepository = Depends(_student_repo_dep)
 ):
     """Create student profile"""
     try:
         # Check if profile already exists
-        existing_profile = student_repo.get_profile_by_user_id(str(current_user.id))
+        existing_profile = await run_in_threadpool(student_repo.get_profile_by_user_id, str(current_user.id), {"_id": 1})
         if existing_profile:
             raise HTTPException(status_code=409, detail="Profile already exists")
         
@@ -220,33 +233,33 @@ async def create_student_profile(
         profile_dict["updated_at"] = datetime.utcnow()
         
         # Create profile
-        created_profile = student_repo.create_profile(str(current_user.id), profile_dict)
+        created_profile = await run_in_threadpool(student_repo.create_profile, str(current_user.id), profile_dict)
         
         if created_profile:
-            return StudentProfileResponse(
-                success=True,
-                data=created_profile,
-                message="Profile created successfully"
-            )
+            return {
+                "success": True,
+                "data": created_profile,
+                "message": "Profile created successfully"
+            }
         else:
             raise HTTPException(status_code=500, detail="Failed to create profile")
             
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error creating student profile: {str(e)}")
+        logger.error("Error creating student profile: %s", e)
         raise HTTPException(status_code=500, detail="Failed to create profile")
 
 
 @router.get("/dashboard")
 async def get_student_dashboard(
-    current_user: User = Depends(get_user_dep),
-    student_repo: StudentRepository = Depends(get_mongodb_repo(StudentRepository))
+    request: Request,
+    current_user: User = Depends(get_user_with_profile_dep)
 ):
     """Get student dashboard data"""
     try:
-        # Get profile
-        profile = student_repo.get_profile_by_user_id(current_user.user_id)
+        # Profile is preloaded alongside the user lookup
+        profile = request.state.profile
         
         # Calculate completion percentage
         completion_percentage = 0
@@ -272,19 +285,19 @@ async def get_student_dashboard(
             else:
                 missing_sections.append("address_details")
                 
-            if profile.get("qualifications") and len(profile["qualifications"]) > 0:
+            if profile.get("qualifications"):
                 completed_sections.append("qualifications")
                 completion_percentage += 20
             else:
                 missing_sections.append("qualifications")
                 
-            if profile.get("interests") and len(profile["interests"]) > 0:
+            if profile.get("interests"):
                 completed_sections.append("interests")
                 completion_percentage += 10
             else:
                 missing_sections.append("interests")
                 
-            if profile.get("college_preferences") and len(profile["college_preferences"]) > 0:
+            if profile.get("college_preferences"):
                 completed_sections.append("college_preferences")
                 completion_percentage += 10
             else:
@@ -315,12 +328,10 @@ async def get_student_dashboard(
                     {"activity": "Profile viewed", "timestamp": datetime.utcnow(), "type": "view"},
                     {"activity": "Dashboard accessed", "timestamp": datetime.utcnow(), "type": "access"}
                 ],
-                "notifications": [
-                    {"message": "Complete your profile to unlock all features", "type": "info", "priority": "medium"}
-                ] if completion_percentage < 90 else [],
+                "notifications": _NOTIFS_INCOMPLETE if completion_percentage < 90 else (),
                 "quick_stats": {
                     "applications_submitted": 0,
-                    "documents_uploaded": len(profile.get("documents", {}).values()) if profile else 0,
+                    "documents_uploaded": len(profile.get("documents") or {}) if profile else 0,
                     "profile_completion": f"{completion_percentage}%",
                     "qualifications_added": len(profile.get("qualifications", [])) if profile else 0,
                     "college_preferences": len(profile.get("college_preferences", [])) if profile else 0
@@ -328,15 +339,12 @@ async def get_student_dashboard(
                 "upcoming_deadlines": [
                     {"exam_name": "Sample Entrance Exam", "date": "2025-12-01", "days_left": 72, "priority": "high"}
                 ],
-                "recommendations": [
-                    {"title": "Complete Profile", "description": "Add missing information to improve visibility", "action": "complete_profile"},
-                    {"title": "Upload Documents", "description": "Upload required certificates and transcripts", "action": "upload_docs"}
-                ] if completion_percentage < 90 else []
+                "recommendations": _RECS_INCOMPLETE if completion_percentage < 90 else ()
             },
             "message": "Dashboard data retrieved successfully"
         }
     except Exception as e:
-        logger.error(f"Error getting student dashboard: {str(e)}")
+        logger.error("Error getting student dashboard: %s", e)
         raise HTTPException(status_code=500, detail="Failed to retrieve dashboard")
 
 
@@ -363,12 +371,12 @@ async def test_student_endpoint():
 async def add_qualification(
     qualification_data: AddQualificationRequest,
     current_user: User = Depends(get_user_dep),
-    student_repo: StudentRepository = Depends(get_mongodb_repo(StudentRepository))
+    student_repo: StudentRepository = Depends(_student_repo_dep)
 ):
     """Add academic qualification to student profile"""
     try:
         # Get existing profile
-        profile = student_repo.get_profile_by_user_id(current_user.user_id)
+        profile = await student_repo.load_profile_by_user_id(current_user.user_id)
         if not profile:
             raise HTTPException(status_code=404, detail="Profile not found. Please create a profile first.")
         
@@ -381,7 +389,7 @@ async def add_qualification(
         qualifications = profile.get("qualifications", [])
         qualifications.append(qual_dict)
         
-        updated_profile = student_repo.update_profile(current_user.user_id, {
+        updated_profile = await run_in_threadpool(student_repo.update_profile, current_user.user_id, {
             "qualifications": qualifications,
             "updated_at": datetime.utcnow()
         })
@@ -398,7 +406,7 @@ async def add_qualification(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error adding qualification: {str(e)}")
+        logger.error("Error adding qualification: %s", e)
         raise HTTPException(status_code=500, detail="Failed to add qualification")
 
 
@@ -406,12 +414,12 @@ async def add_qualification(
 async def add_college_preference(
     preference_data: AddCollegePreferenceRequest,
     current_user: User = Depends(get_user_dep),
-    student_repo: StudentRepository = Depends(get_mongodb_repo(StudentRepository))
+    student_repo: StudentRepository = Depends(_student_repo_dep)
 ):
     """Add college preference to student profile"""
     try:
         # Get existing profile
-        profile = student_repo.get_profile_by_user_id(current_user.user_id)
+        profile = await student_repo.load_profile_by_user_id(current_user.user_id)
         if not profile:
             raise HTTPException(status_code=404, detail="Profile not found. Please create a profile first.")
         
@@ -425,7 +433,7 @@ async def add_college_preference(
         preferences = profile.get("college_preferences", [])
         preferences.append(pref_dict)
         
-        updated_profile = student_repo.update_profile(current_user.user_id, {
+        updated_profile = await run_in_threadpool(student_repo.update_profile, current_user.user_id, {
             "college_preferences": preferences,
             "updated_at": datetime.utcnow()
         })
@@ -442,7 +450,7 @@ async def add_college_preference(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error adding college preference: {str(e)}")
+        logger.error("Error adding college preference: %s", e)
         raise HTTPException(status_code=500, detail="Failed to add college preference")
 
 
@@ -450,12 +458,12 @@ async def add_college_preference(
 async def update_interests(
     interests_data: UpdateInterestsRequest,
     current_user: User = Depends(get_user_dep),
-    student_repo: StudentRepository = Depends(get_mongodb_repo(StudentRepository))
+    student_repo: StudentRepository = Depends(_student_repo_dep)
 ):
     """Update student interests and career goals"""
     try:
         # Get existing profile
-        profile = student_repo.get_profile_by_user_id(current_user.user_id)
+        profile = await run_in_threadpool(student_repo.get_profile_by_user_id, current_user.user_id, {"_id": 1})
         if not profile:
             raise HTTPException(status_code=404, detail="Profile not found. Please create a profile first.")
         
@@ -463,19 +471,19 @@ async def update_interests(
         update_data = interests_data.dict(exclude_unset=True)
         update_data["updated_at"] = datetime.utcnow()
         
-        updated_profile = student_repo.update_profile(current_user.user_id, update_data)
+        updated_profile = await run_in_threadpool(student_repo.update_profile, current_user.user_id, update_data)
         
         if updated_profile:
-            return StudentProfileResponse(
-                success=True,
-                data=updated_profile,
-                message="Interests and career goals updated successfully"
-            )
+            return {
+                "success": True,
+                "data": updated_profile,
+                "message": "Interests and career goals updated successfully"
+            }
         else:
             raise HTTPException(status_code=500, detail="Failed to update interests")
             
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating interests: {str(e)}")
+        logger.error("Error updating interests: %s", e)
         raise HTTPException(status_code=500, detail="Failed to update interests")
\ No newline at end of file
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from starlette.concurrency import run_in_threadpool
 from starlette.status import HTTP_200_OK
 from typing import Literal, Annotated, Optional
 from datetime import timedelta
@@ -15,6 +16,7 @@ from app.schema.user import ListUsersResponse, UpdateUserResponse, User, Token
 from app.schema.auth import get_login_form, LoginForm
 from app.model.user import UserDB
 from app.core.security import create_access_token, bearer_scheme
+from app.api.responses import PydanticResponse
 from app.core.config import ACCESS_TOKEN_EXPIRE_MINUTES
 
 
@@ -53,7 +55,7 @@ async def login_for_access_token(
         )
 
     # 🧠 Authenticate
-    user = authenticate_user(username=login_id, password=form_data.password)
+    user = await run_in_threadpool(authenticate_user, username=login_id, password=form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -127,7 +129,7 @@ def get_users_list(
     current_user: UserDB = Depends(requires_read_users),
     usersList: ListUsersResponse = Depends(get_users_dep),
 ):
-    return usersList
+    return PydanticResponse(usersList, exclude_none=True)
 
 
 @router.delete(
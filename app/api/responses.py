@@ -0,0 +1,21 @@
+from typing import Any
+from pydantic import BaseModel
+from starlette.responses import Response
+
+
+class PydanticResponse(Response):
+    """
+    JSON response that serializes a Pydantic model in a single `model_dump_json` call.
+
+    Returning it from a route skips FastAPI's response_model round trip (dump,
+    re-validate, serialize), so only use it with content that was built as the
+    route's response model.
+    """
+    media_type = "application/json"
+
+    def __init__(self, content: BaseModel, *, exclude_none: bool = False, **kwargs: Any):
+        self.exclude_none = exclude_none
+        super().__init__(content, **kwargs)
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.model_dump_json(by_alias=True, exclude_none=self.exclude_none).encode()
@@ -1,22 +1,70 @@
-from typing import List, Optional, Callable, Any
+from dataclasses import dataclass, field
+from typing import List, Optional, Callable, Any, Iterable, Tuple, Dict, Set, FrozenSet
 from functools import wraps
 from fastapi import Depends, HTTPException, status
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
 from jwt import InvalidTokenError
-import jwt
 from app.core.config import (
-    SECRET_KEY, ALGORITHM, MONGO_COLLECTION_ROLES, 
-    MONGO_COLLECTION_PERMISSIONS, MONGO_COLLECTION_USER_ROLES
+    MONGO_COLLECTION_ROLES, 
+    MONGO_COLLECTION_PERMISSIONS, MONGO_COLLECTION_USER_ROLES,
+    DEFAULT_PERMISSIONS
 )
+from app.core import permission_cache
 from app.core.dependencies import _get_mongo_client, get_mongodb_repo
 from app.repository.role import RoleRepository, PermissionRepository, UserRoleRepository
-from app.schema.user import TokenData
 from app.model.user import UserDB
-from app.core.dependencies import get_user
+from app.core.dependencies import get_user_async
 from fastapi.security import HTTPAuthorizationCredentials
-from app.core.security import bearer_scheme
+from app.core.security import bearer_scheme, decode_access_token, credentials_exception
 from pymongo import MongoClient
 
 
+# Bit flags for known roles and permissions, so hot-path access checks are integer ANDs
+ROLE_ADMIN = 1
+ROLE_STUDENT = 2
+ROLE_COUNSELOR = 4
+ROLE_USER = 8
+ROLE_MODERATOR = 16
+
+ROLE_BITS = {
+    "admin": ROLE_ADMIN,
+    "student": ROLE_STUDENT,
+    "counselor": ROLE_COUNSELOR,
+    "user": ROLE_USER,
+    "moderator": ROLE_MODERATOR,
+}
+PERMISSION_BITS = {perm.name: 1 << i for i, perm in enumerate(DEFAULT_PERMISSIONS)}
+
+PERM_MANAGE_PROFILE = PERMISSION_BITS["manage_profile"]
+
+
+def access_masks(role_names: Iterable[str], permission_names: Iterable[str]) -> Tuple[int, int]:
+    """Fold role and permission names into (roles_mask, permissions_mask)"""
+    roles_mask = 0
+    for role_name in role_names:
+        roles_mask |= ROLE_BITS.get(role_name, 0)
+
+    perms_mask = 0
+    for perm_name in permission_names:
+        perms_mask |= PERMISSION_BITS.get(perm_name, 0)
+    return roles_mask, perms_mask
+
+
+def load_user_access(mongo_client: MongoClient, user_id: str) -> Dict[str, FrozenSet[str]]:
+    """Get a user's role and permission names from the shared cache, or with one aggregation"""
+    access = permission_cache.get_cached_access(user_id)
+    if access is None:
+        result = PermissionRepository(mongo_client).get_admin_and_permissions(
+            MONGO_COLLECTION_USER_ROLES,
+            MONGO_COLLECTION_ROLES,
+            MONGO_COLLECTION_PERMISSIONS,
+            user_id
+        )
+        access = permission_cache.set_cached_access(user_id, result["roles"], result["permissions"])
+    return access
+
+
 class AuthorizationService:
     """Service for handling authorization operations"""
     
@@ -25,53 +73,51 @@ class AuthorizationService:
         self.role_repo = RoleRepository(mongo_client)
         self.permission_repo = PermissionRepository(mongo_client)
         self.user_role_repo = UserRoleRepository(mongo_client)
+        # One instance per request, so these double as request-scoped caches
+        self._role_cache: Dict[str, Set[str]] = {}
+        self._perm_cache: Dict[str, Set[str]] = {}
+    
+    def _load_access(self, user_id: str) -> None:
+        """Fetch the user's role and permission names in one round trip"""
+        access = load_user_access(self.mongo_client, user_id)
+        self._role_cache[user_id] = access["roles"]
+        self._perm_cache[user_id] = access["permissions"]
+    
+    def _get_roles(self, user_id: str) -> Set[str]:
+        """Get the user's role names, fetching them at most once per service instance"""
+        if user_id not in self._role_cache:
+            self._load_access(user_id)
+        return self._role_cache[user_id]
+    
+    def _get_perms(self, user_id: str) -> Set[str]:
+        """Get the user's permission names, fetching them at most once per service instance"""
+        if user_id not in self._perm_cache:
+            self._load_access(user_id)
+        return self._perm_cache[user_id]
     
     def user_has_permission(self, user_id: str, permission_name: str) -> bool:
         """Check if a user has a specific permission (admins have all permissions)"""
-        # First check if user is admin (admins have all permissions)
-        if self.user_has_role(user_id, "admin"):
-            return True
-            
-        # Otherwise check specific permissions
-        user_permissions = self.permission_repo.get_permissions_for_user(
-            MONGO_COLLECTION_USER_ROLES,
-            MONGO_COLLECTION_ROLES,
-            MONGO_COLLECTION_PERMISSIONS,
-            user_id
-        )
-        return any(perm.name == permission_name for perm in user_permissions)
+        return "admin" in self._get_roles(user_id) or permission_name in self._get_perms(user_id)
     
     def user_has_role(self, user_id: str, role_name: str) -> bool:
         """Check if a user has a specific role"""
-        return self.user_role_repo.user_has_role(
-            MONGO_COLLECTION_USER_ROLES,
-            user_id,
-            role_name,
-            MONGO_COLLECTION_ROLES
-        )
+        return role_name in self._get_roles(user_id)
     
-    def user_has_any_role(self, user_id: str, role_names: List[str]) -> bool:
+    def user_has_any_role(self, user_id: str, role_names: Iterable[str]) -> bool:
         """Check if a user has any of the specified roles"""
-        return any(self.user_has_role(user_id, role_name) for role_name in role_names)
+        return not self._get_roles(user_id).isdisjoint(role_names)
     
+    def get_access_masks(self, user_id: str) -> Tuple[int, int]:
+        """Get (roles_mask, permissions_mask) for a user"""
+        return access_masks(self._get_roles(user_id), self._get_perms(user_id))
+
     def get_user_roles(self, user_id: str) -> List[str]:
         """Get all role names for a user"""
-        user_roles = self.role_repo.get_roles_for_user(
-            MONGO_COLLECTION_USER_ROLES,
-            MONGO_COLLECTION_ROLES,
-            user_id
-        )
-        return [role.name for role in user_roles]
+        return list(self._get_roles(user_id))
     
     def get_user_permissions(self, user_id: str) -> List[str]:
         """Get all permission names for a user"""
-        user_permissions = self.permission_repo.get_permissions_for_user(
-            MONGO_COLLECTION_USER_ROLES,
-            MONGO_COLLECTION_ROLES,
-            MONGO_COLLECTION_PERMISSIONS,
-            user_id
-        )
-        return [perm.name for perm in user_permissions]
+        return list(self._get_perms(user_id))
 
 
 def get_authorization_service(mongo_client: MongoClient = Depends(_get_mongo_client)) -> AuthorizationService:
@@ -84,26 +130,19 @@ async def get_current_user(
     mongo_client: MongoClient = Depends(_get_mongo_client)
 ) -> UserDB:
     """Get the current authenticated user"""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
     try:
         # Extract token from credentials
         token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_access_token(token)
         username: str = payload.get("sub")
         if username is None:
-            raise credentials_exception
-        token_data = TokenData(username=username)
+            raise credentials_exception()
     except InvalidTokenError:
-        raise credentials_exception
+        raise credentials_exception()
 
-    user = get_user(token_data.username)
+    user = await get_user_async(username, mongo_client)
     if user is None:
-        raise credentials_exception
+        raise credentials_exception()
     
     # Check if user is active
     if not user.is_active:
@@ -115,6 +154,58 @@ async def get_current_user(
     return user
 
 
+@dataclass(frozen=True)
+class AuthContext:
+    """Authenticated user together with their role and permission names"""
+    user: UserDB
+    roles: FrozenSet[str]
+    permissions: FrozenSet[str]
+
+    def has_permission(self, permission_name: str) -> bool:
+        """Check a permission (admins have all permissions)"""
+        return "admin" in self.roles or permission_name in self.permissions
+
+    def access_masks(self) -> Tuple[int, int]:
+        """Get (roles_mask, permissions_mask) for the user"""
+        return access_masks(self.roles, self.permissions)
+
+
+async def get_auth_context(
+    request: Request,
+    current_user: UserDB = Depends(get_current_user),
+    mongo_client: MongoClient = Depends(_get_mongo_client)
+) -> AuthContext:
+    """
+    Resolve the current user's roles and permissions, from the shared
+    permission cache or with one aggregation.
+
+    The result is stored on `request.state.auth`, so it is built at most once
+    per request no matter how many checkers depend on it.
+    """
+    auth_context = getattr(request.state, "auth", None)
+    if auth_context is not None:
+        return auth_context
+
+    user_id = str(current_user.id)
+    access = permission_cache.get_cached_access(user_id)
+    if access is None:
+        access = await run_in_threadpool(load_user_access, mongo_client, user_id)
+    auth_context = AuthContext(
+        user=current_user,
+        roles=access["roles"],
+        permissions=access["permissions"]
+    )
+    request.state.auth = auth_context
+    return auth_context
+
+
+async def get_user_permissions(
+    auth_context: AuthContext = Depends(get_auth_context)
+) -> FrozenSet[str]:
+    """Get the current user's permission names, resolved once per request"""
+    return auth_context.permissions
+
+
 async def get_current_active_user(
     current_user: UserDB = Depends(get_current_user)
 ) -> UserDB:
@@ -124,6 +215,8 @@ async def get_current_active_user(
 
 def require_permission(permission_name: str):
     """Decorator that requires a specific permission"""
+    denied_detail = f"Permission '{permission_name}' required"
+
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         @wraps(func)
         async def wrapper(*args, **kwargs):
@@ -140,7 +233,7 @@ def require_permission(permission_name: str):
             if not auth_service.user_has_permission(str(current_user.id), permission_name):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"Permission '{permission_name}' required"
+                    detail=denied_detail
                 )
             
             return await func(*args, **kwargs)
@@ -150,6 +243,8 @@ def require_permission(permission_name: str):
 
 def require_role(role_name: str):
     """Decorator that requires a specific role"""
+    denied_detail = f"Role '{role_name}' required"
+
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         @wraps(func)
         async def wrapper(*args, **kwargs):
@@ -166,7 +261,7 @@ def require_role(role_name: str):
             if not auth_service.user_has_role(str(current_user.id), role_name):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"Role '{role_name}' required"
+                    detail=denied_detail
                 )
             
             return await func(*args, **kwargs)
@@ -176,6 +271,10 @@ def require_role(role_name: str):
 
 def require_any_role(role_names: List[str]):
     """Decorator that requires any of the specified roles"""
+    required_roles = frozenset(role_names)
+    roles_str = "', '".join(role_names)
+    denied_detail = f"One of these roles required: '{roles_str}'"
+
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         @wraps(func)
         async def wrapper(*args, **kwargs):
@@ -189,11 +288,10 @@ def require_any_role(role_names: List[str]):
                     detail="Authorization dependencies not properly injected"
                 )
             
-            if not auth_service.user_has_any_role(str(current_user.id), role_names):
-                roles_str = "', '".join(role_names)
+            if not auth_service.user_has_any_role(str(current_user.id), required_roles):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
-                    detail=f"One of these roles required: '{roles_str}'"
+                    detail=denied_detail
                 )
             
             return await func(*args, **kwargs)
@@ -202,67 +300,63 @@ def require_any_role(role_names: List[str]):
 
 
 # Permission-based dependencies
+@dataclass(slots=True, frozen=True)
 class PermissionChecker:
     """Class to create permission-checking dependencies"""
+    permission_name: str
+    denied_detail: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "denied_detail", f"Permission '{self.permission_name}' required")
     
-    def __init__(self, permission_name: str):
-        self.permission_name = permission_name
-    
-    def __call__(
-        self,
-        current_user: UserDB = Depends(get_current_user),
-        auth_service: AuthorizationService = Depends(get_authorization_service)
-    ) -> UserDB:
-        # Admins have all permissions
-        if auth_service.user_has_role(str(current_user.id), "admin"):
-            return current_user
-            
-        # Check specific permission for non-admin users
-        if not auth_service.user_has_permission(str(current_user.id), self.permission_name):
+    async def __call__(self, auth_context: AuthContext = Depends(get_auth_context)) -> UserDB:
+        if not auth_context.has_permission(self.permission_name):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Permission '{self.permission_name}' required"
+                detail=self.denied_detail
             )
-        return current_user
+        return auth_context.user
 
 
+@dataclass(slots=True, frozen=True)
 class RoleChecker:
     """Class to create role-checking dependencies"""
+    role_name: str
+    denied_detail: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "denied_detail", f"Role '{self.role_name}' required")
     
-    def __init__(self, role_name: str):
-        self.role_name = role_name
-    
-    def __call__(
-        self,
-        current_user: UserDB = Depends(get_current_user),
-        auth_service: AuthorizationService = Depends(get_authorization_service)
-    ) -> UserDB:
-        if not auth_service.user_has_role(str(current_user.id), self.role_name):
+    async def __call__(self, auth_context: AuthContext = Depends(get_auth_context)) -> UserDB:
+        if self.role_name not in auth_context.roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Role '{self.role_name}' required"
+                detail=self.denied_detail
             )
-        return current_user
+        return auth_context.user
 
 
+@dataclass(slots=True, frozen=True)
 class AnyRoleChecker:
     """Class to create dependencies that check for any of specified roles"""
+    role_names: Tuple[str, ...]
+    required_roles: FrozenSet[str] = field(init=False)
+    denied_detail: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        # Accept any iterable of names, but store them in hashable form
+        object.__setattr__(self, "role_names", tuple(self.role_names))
+        object.__setattr__(self, "required_roles", frozenset(self.role_names))
+        roles_str = "', '".join(self.role_names)
+        object.__setattr__(self, "denied_detail", f"One of these roles required: '{roles_str}'")
     
-    def __init__(self, role_names: List[str]):
-        self.role_names = role_names
-    
-    def __call__(
-        self,
-        current_user: UserDB = Depends(get_current_user),
-        auth_service: AuthorizationService = Depends(get_authorization_service)
-    ) -> UserDB:
-        if not auth_service.user_has_any_role(str(current_user.id), self.role_names):
-            roles_str = "', '".join(self.role_names)
+    async def __call__(self, auth_context: AuthContext = Depends(get_auth_context)) -> UserDB:
+        if auth_context.roles.isdisjoint(self.required_roles):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"One of these roles required: '{roles_str}'"
+                detail=self.denied_detail
             )
-        return current_user
+        return auth_context.user
 
 
 # Convenience functions to create dependencies
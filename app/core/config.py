@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
-from typing import List
+from types import MappingProxyType
+from typing import List, NamedTuple, FrozenSet
 
 from starlette.config import Config
 from typing import List
@@ -18,14 +19,21 @@ config = Config(env_file)
 
 MONGODB_URL: str = config("MONGODB_URL", default="mongodb://localhost:27017/")
 MONGO_DATABASE: str = config("MONGO_DATABASE", default="clean-database")
-MONGODB_MAX_CONNECTIONS_COUNT: int = config("MONGODB_MAX_CONNECTIONS_COUNT", cast=int, default=20)
-MONGODB_MIN_CONNECTIONS_COUNT: int = config("MONGODB_MIN_CONNECTIONS_COUNT", cast=int, default=1)
+MONGODB_MAX_CONNECTIONS_COUNT: int = config("MONGODB_MAX_CONNECTIONS_COUNT", cast=int, default=100)
+MONGODB_MIN_CONNECTIONS_COUNT: int = config("MONGODB_MIN_CONNECTIONS_COUNT", cast=int, default=10)
+MONGODB_MAX_IDLE_TIME_MS: int = config("MONGODB_MAX_IDLE_TIME_MS", cast=int, default=300000)
+MONGODB_WAIT_QUEUE_TIMEOUT_MS: int = config("MONGODB_WAIT_QUEUE_TIMEOUT_MS", cast=int, default=2000)
+MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = config("MONGODB_SERVER_SELECTION_TIMEOUT_MS", cast=int, default=3000)
+MONGODB_COMPRESSORS: str = config("MONGODB_COMPRESSORS", default="zstd,zlib")
+MONGODB_BATCH_MAX_OPS: int = config("MONGODB_BATCH_MAX_OPS", cast=int, default=500)
+MONGODB_BATCH_FLUSH_INTERVAL_MS: int = config("MONGODB_BATCH_FLUSH_INTERVAL_MS", cast=int, default=50)
 
 MONGO_COLLECTION_USERS: str = config("MONGO_COLLECTION_USERS", default="user-collection")
 MONGO_COLLECTION_ROLES: str = config("MONGO_COLLECTION_ROLES", default="role-collection")
 MONGO_COLLECTION_PERMISSIONS: str = config("MONGO_COLLECTION_PERMISSIONS", default="permission-collection")
 MONGO_COLLECTION_USER_ROLES: str = config("MONGO_COLLECTION_USER_ROLES", default="user-role-collection")
 MONGO_COLLECTION_STUDENT_PROFILES: str = config("MONGO_COLLECTION_STUDENT_PROFILES", default="student-profiles")
+MONGO_COLLECTION_META: str = config("MONGO_COLLECTION_META", default="_meta")
 
 
 # =========== PROJECT ==========
@@ -48,8 +56,8 @@ AWS_REGION: str = config("AWS_REGION", default="us-east-1")
 S3_BUCKET_NAME: str = config("S3_BUCKET_NAME", default="student-uploads")
 S3_UPLOAD_ENABLED: bool = config("S3_UPLOAD_ENABLED", cast=bool, default=False)
 MAX_UPLOAD_SIZE: int = config("MAX_UPLOAD_SIZE", cast=int, default=10485760)  # 10MB in bytes
-ALLOWED_IMAGE_EXTENSIONS: List[str] = ["jpg", "jpeg", "png", "gif"]
-ALLOWED_DOCUMENT_EXTENSIONS: List[str] = ["pdf", "doc", "docx", "txt"]
+ALLOWED_IMAGE_EXTENSIONS: FrozenSet[str] = frozenset({"jpg", "jpeg", "png", "gif"})
+ALLOWED_DOCUMENT_EXTENSIONS: FrozenSet[str] = frozenset({"pdf", "doc", "docx", "txt"})
 
 # ======= EMAIL Configuration =======
 EMAIL_ENABLED: bool = config("EMAIL_ENABLED", cast=bool, default=False)
@@ -59,59 +67,57 @@ FROM_NAME: str = config("FROM_NAME", default="Student Portal")
 DEFAULT_SMTP_PROVIDER: str = config("DEFAULT_SMTP_PROVIDER", default="gmail")
 
 # SMTP Providers Configuration
-SMTP_CONFIGS = {
-    "gmail": {
+SMTP_CONFIGS = MappingProxyType({
+    "gmail": MappingProxyType({
         "host": config("GMAIL_SMTP_HOST", default="smtp.gmail.com"),
         "port": config("GMAIL_SMTP_PORT", cast=int, default=587),
         "username": config("GMAIL_USERNAME", default=""),
         "password": config("GMAIL_PASSWORD", default=""),
         "use_tls": True,
         "use_ssl": False,
-    },
-    "outlook": {
+    }),
+    "outlook": MappingProxyType({
         "host": config("OUTLOOK_SMTP_HOST", default="smtp-mail.outlook.com"),
         "port": config("OUTLOOK_SMTP_PORT", cast=int, default=587),
         "username": config("OUTLOOK_USERNAME", default=""),
         "password": config("OUTLOOK_PASSWORD", default=""),
         "use_tls": True,
         "use_ssl": False,
-    },
-    "yahoo": {
+    }),
+    "yahoo": MappingProxyType({
         "host": config("YAHOO_SMTP_HOST", default="smtp.mail.yahoo.com"),
         "port": config("YAHOO_SMTP_PORT", cast=int, default=587),
         "username": config("YAHOO_USERNAME", default=""),
         "password": config("YAHOO_PASSWORD", default=""),
         "use_tls": True,
         "use_ssl": False,
-    }
-}
+    }),
+})
 
-# ======= SMS Configuration =======
-SMS_ENABLED: bool = config("SMS_ENABLED", cast=bool, default=False)
 # ======= SMS Configuration =======
 SMS_ENABLED: bool = config("SMS_ENABLED", cast=bool, default=False)
 SMS_PROVIDER: str = config("SMS_PROVIDER", default="local")
 DEFAULT_SMS_PROVIDER: str = config("DEFAULT_SMS_PROVIDER", default="twilio")
-SMS_CONFIGS = {
-    "twilio": {
+SMS_CONFIGS = MappingProxyType({
+    "twilio": MappingProxyType({
         "account_sid": config("TWILIO_ACCOUNT_SID", default=""),
         "auth_token": config("TWILIO_AUTH_TOKEN", default=""),
         "from_number": config("TWILIO_FROM_NUMBER", default=""),
-    },
-    "aws_sns": {
+    }),
+    "aws_sns": MappingProxyType({
         "aws_access_key_id": config("AWS_SNS_ACCESS_KEY_ID", default=""),
         "aws_secret_access_key": config("AWS_SNS_SECRET_ACCESS_KEY", default=""),
         "region": config("AWS_SNS_REGION", default="us-east-1"),
-    },
-    "nexmo": {
+    }),
+    "nexmo": MappingProxyType({
         "api_key": config("NEXMO_API_KEY", default=""),
         "api_secret": config("NEXMO_API_SECRET", default=""),
         "from_number": config("NEXMO_FROM_NUMBER", default=""),
-    },
-    "local": {
+    }),
+    "local": MappingProxyType({
         "log_file": config("SMS_LOG_FILE", default="sms_log.txt"),
-    }
-}
+    }),
+})
 
 # =========== AUTHORIZATION ==========
 # Default system roles
@@ -121,17 +127,24 @@ DEFAULT_MODERATOR_ROLE = "moderator"
 DEFAULT_STUDENT_ROLE = "student"
 
 # Default permissions
-DEFAULT_PERMISSIONS = [
-    {"name": "read_users", "resource": "users", "action": "read", "description": "Read user information"},
-    {"name": "write_users", "resource": "users", "action": "write", "description": "Create and update users"},
-    {"name": "delete_users", "resource": "users", "action": "delete", "description": "Delete users"},
-    {"name": "read_posts", "resource": "posts", "action": "read", "description": "Read posts"},
-    {"name": "write_posts", "resource": "posts", "action": "write", "description": "Create and update posts"},
-    {"name": "delete_posts", "resource": "posts", "action": "delete", "description": "Delete posts"},
-    {"name": "manage_roles", "resource": "roles", "action": "manage", "description": "Manage user roles and permissions"},
-    {"name": "read_admin", "resource": "admin", "action": "read", "description": "Access admin dashboard"},
-    {"name": "manage_profile", "resource": "student_profile", "action": "manage", "description": "Manage student profile"},
-    {"name": "upload_documents", "resource": "documents", "action": "upload", "description": "Upload documents and images"},
-    {"name": "apply_colleges", "resource": "applications", "action": "apply", "description": "Apply to colleges"},
-    {"name": "track_applications", "resource": "applications", "action": "read", "description": "Track application status"},
-]
\ No newline at end of file
+class DefaultPermission(NamedTuple):
+    name: str
+    resource: str
+    action: str
+    description: str
+
+
+DEFAULT_PERMISSIONS = (
+    DefaultPermission("read_users", "users", "read", "Read user information"),
+    DefaultPermission("write_users", "users", "write", "Create and update users"),
+    DefaultPermission("delete_users", "users", "delete", "Delete users"),
+    DefaultPermission("read_posts", "posts", "read", "Read posts"),
+    DefaultPermission("write_posts", "posts", "write", "Create and update posts"),
+    DefaultPermission("delete_posts", "posts", "delete", "Delete posts"),
+    DefaultPermission("manage_roles", "roles", "manage", "Manage user roles and permissions"),
+    DefaultPermission("read_admin", "admin", "read", "Access admin dashboard"),
+    DefaultPermission("manage_profile", "student_profile", "manage", "Manage student profile"),
+    DefaultPermission("upload_documents", "documents", "upload", "Upload documents and images"),
+    DefaultPermission("apply_colleges", "applications", "apply", "Apply to colleges"),
+    DefaultPermission("track_applications", "applications", "read", "Track application status"),
+)
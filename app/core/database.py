@@ -1,3 +1,5 @@
+import asyncio
+from datetime import datetime
 from typing import Callable
 from contextlib import contextmanager
 from fastapi import FastAPI
@@ -6,19 +8,142 @@ from pymongo import MongoClient
 from pymongo.database import Database
 from app.core.config import (
     MONGODB_URL, MONGODB_MAX_CONNECTIONS_COUNT, MONGODB_MIN_CONNECTIONS_COUNT,
-    MONGO_DATABASE
+    MONGODB_MAX_IDLE_TIME_MS, MONGODB_WAIT_QUEUE_TIMEOUT_MS, MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+    MONGODB_COMPRESSORS, MONGODB_BATCH_MAX_OPS, MONGODB_BATCH_FLUSH_INTERVAL_MS, PROJECT_NAME,
+    MONGO_DATABASE, MONGO_COLLECTION_USERS, MONGO_COLLECTION_ROLES,
+    MONGO_COLLECTION_PERMISSIONS, MONGO_COLLECTION_USER_ROLES,
+    MONGO_COLLECTION_STUDENT_PROFILES, MONGO_COLLECTION_META
 )
+from app.repository.batch import BatchProcessor
 
 
 class MongoDB:
     """
-    MongoDB class to hold a single MongoClient instance for the application.
+    MongoDB class to hold a single MongoClient instance for the application,
+    along with the write-behind queue that batches fire-and-forget writes.
     """
     client: MongoClient = None
+    batch_writer: BatchProcessor = None
 
 # Create a global MongoDB instance
 mongo_db = MongoDB()
 
+def create_mongo_client() -> MongoClient:
+    """
+    Creates the application's MongoClient with the configured pool settings.
+
+    Returns:
+        MongoClient: A client with bounded pool waits, wire compression and retryable reads and writes.
+    """
+    return MongoClient(
+        MONGODB_URL,
+        MaxPoolSize=MONGODB_MAX_CONNECTIONS_COUNT,
+        MinPoolSize=MONGODB_MIN_CONNECTIONS_COUNT,
+        maxIdleTimeMS=MONGODB_MAX_IDLE_TIME_MS,
+        waitQueueTimeoutMS=MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+        serverSelectionTimeoutMS=MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+        compressors=MONGODB_COMPRESSORS,
+        retryReads=True,
+        retryWrites=True,
+        appname=PROJECT_NAME,
+    )
+
+
+# Counselor lead indexes, shared with the repository queries that hint them.
+# Equality fields first, then the sort/range field.
+LEADS_BY_COUNSELOR_INDEX = [("assigned_counselor_id", 1), ("created_at", -1)]
+LEADS_BY_COUNSELOR_STATUS_INDEX = [("assigned_counselor_id", 1), ("status", 1), ("created_at", -1)]
+LEADS_BY_COUNSELOR_QUALITY_INDEX = [("assigned_counselor_id", 1), ("quality", 1), ("created_at", -1)]
+
+# Unique names the auth seed relies on to upsert roles and skip duplicate permissions,
+# so they are created before seeding starts
+AUTH_SEED_INDEXES = (
+    (MONGO_COLLECTION_ROLES, [("name", 1)], {"unique": True}),
+    (MONGO_COLLECTION_PERMISSIONS, [("name", 1)], {"unique": True}),
+)
+
+# (collection, keys, options) for every other index the application relies on
+APP_INDEXES = (
+    (MONGO_COLLECTION_USERS, [("username", 1)], {"unique": True}),
+    (MONGO_COLLECTION_USERS, [("created_at", -1), ("_id", 1)], {}),
+    (MONGO_COLLECTION_USER_ROLES, [("user_id", 1), ("role_id", 1)], {"unique": True}),
+    (MONGO_COLLECTION_STUDENT_PROFILES, [("user_id", 1)], {}),
+    ("lead_notes", [("lead_id", 1), ("created_at", -1)], {}),
+    ("call_logs", [("lead_id", 1), ("call_date", -1)], {}),
+    ("message_logs", [("lead_id", 1), ("sent_at", -1)], {}),
+    ("leads", LEADS_BY_COUNSELOR_INDEX, {}),
+    ("leads", LEADS_BY_COUNSELOR_STATUS_INDEX, {}),
+    ("leads", LEADS_BY_COUNSELOR_QUALITY_INDEX, {}),
+    ("leads", [("assigned_counselor_id", 1), ("next_follow_up", 1)], {}),
+    # Partial indexes cover only the documents the hot queries can match
+    ("counselor_profiles", [("current_leads_count", 1)],
+     {"partialFilterExpression": {"status": "active", "is_available": True}}),
+    ("call_logs", [("counselor_id", 1), ("call_date", -1)], {}),
+    ("notifications", [("counselor_id", 1), ("created_at", -1)], {}),
+    ("notifications", [("counselor_id", 1), ("read", 1), ("created_at", -1)],
+     {"partialFilterExpression": {"read": False}}),
+)
+
+
+def ensure_indexes(mongo_client: MongoClient, indexes=APP_INDEXES) -> int:
+    """
+    Creates the indexes used by auth, profile, lead and counselor lookups.
+
+    Args:
+        mongo_client (MongoClient): The MongoDB client instance.
+        indexes: (collection, keys, options) triples to create; defaults to `APP_INDEXES`.
+
+    Returns:
+        int: The number of indexes that could not be created.
+
+    `create_index` is idempotent, so this is safe to run on every startup. Each
+    index is created independently, so one failure (e.g. duplicates blocking a
+    unique index) doesn't prevent the others.
+    """
+    db = mongo_client[MONGO_DATABASE]
+    failures = 0
+    for collection, keys, options in indexes:
+        try:
+            db[collection].create_index(keys, **options)
+        except Exception as e:
+            failures += 1
+            logger.error(f'Failed to create index {keys} on {collection}: {str(e)}')
+    return failures
+
+
+# Sentinel in the _meta collection recording that lead status counters were backfilled
+LEAD_STATUS_COUNTERS_SENTINEL_ID = "lead_status_counters_backfill"
+
+
+def backfill_lead_status_counters(mongo_client: MongoClient) -> bool:
+    """
+    Builds `lead_status_counters` from the existing leads, once per database.
+
+    Args:
+        mongo_client (MongoClient): The MongoDB client instance.
+
+    Returns:
+        bool: True if the backfill ran, False if it had already been applied.
+
+    The counters are best-effort: a status change written while the recount
+    runs (by another worker, or one still on old code during a deploy) can be
+    overwritten by it. `POST /api/v1/admin/leads/status-counters/rebuild` recomputes
+    them on demand. The sentinel is upserted, so workers racing through
+    startup both finish cleanly.
+    """
+    from app.repository.counselor import LeadRepository
+    meta = mongo_client[MONGO_DATABASE][MONGO_COLLECTION_META]
+    if meta.find_one({"_id": LEAD_STATUS_COUNTERS_SENTINEL_ID}, {"_id": 1}):
+        return False
+    LeadRepository(mongo_client).rebuild_status_counters("leads")
+    meta.update_one(
+        {"_id": LEAD_STATUS_COUNTERS_SENTINEL_ID},
+        {"$set": {"at": datetime.utcnow()}},
+        upsert=True
+    )
+    return True
+
+
 def mongodb_startup(app: FastAPI) -> None:
     """
     Establishes a connection to the MongoDB database on application startup.
@@ -31,23 +156,84 @@ def mongodb_startup(app: FastAPI) -> None:
     """
     logger.info('connect to the MongoDB...')
     # Initialize MongoDB client with connection pooling
-    mongo_client = MongoClient(
-        MONGODB_URL,
-        MaxPoolSize = MONGODB_MAX_CONNECTIONS_COUNT,
-        MinPoolSize = MONGODB_MIN_CONNECTIONS_COUNT,
-    )
+    mongo_client = create_mongo_client()
     mongo_db.client = mongo_client
     app.state.mongo_client = mongo_client
+    mongo_db.batch_writer = BatchProcessor(
+        mongo_client[MONGO_DATABASE],
+        max_ops=MONGODB_BATCH_MAX_OPS,
+        flush_interval_ms=MONGODB_BATCH_FLUSH_INTERVAL_MS,
+    )
     logger.info('MongoDB connection succeeded! ')
-    
-    # Initialize authorization system
+
     try:
-        from app.core.init_auth import initialize_auth_system
-        logger.info('Initializing authorization system...')
-        result = initialize_auth_system(mongo_client)
-        logger.info(f'Authorization system initialized: {result["status"]}')
+        if backfill_lead_status_counters(mongo_client):
+            logger.info('Lead status counters backfilled')
     except Exception as e:
-        logger.error(f'Failed to initialize authorization system: {str(e)}')
+        logger.error(f'Failed to backfill lead status counters: {str(e)}')
+
+    # The auth seed needs only the unique role/permission name indexes, so it runs right
+    # after those; when an event loop is running the seed and the remaining indexes are
+    # handed to the executor and overlap instead of blocking startup
+    logger.info('Initializing authorization system...')
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    if loop is None:
+        if ensure_indexes(mongo_client) == 0:
+            logger.info('MongoDB indexes ensured')
+        try:
+            result = seed_auth_system(mongo_client)
+            logger.info(f'Authorization system initialized: {result["status"]}')
+        except Exception as e:
+            logger.error(f'Failed to initialize authorization system: {str(e)}')
+    else:
+        index_future = loop.run_in_executor(None, ensure_indexes, mongo_client)
+        index_future.add_done_callback(_log_index_creation)
+        future = loop.run_in_executor(None, seed_auth_system, mongo_client)
+        future.add_done_callback(_log_auth_initialization)
+        app.state.index_future = index_future
+        app.state.auth_init_future = future
+
+
+def seed_auth_system(mongo_client: MongoClient) -> dict:
+    """
+    Creates `AUTH_SEED_INDEXES`, then seeds the default roles, permissions and admin.
+
+    Args:
+        mongo_client (MongoClient): The MongoDB client instance.
+
+    Returns:
+        dict: The result of `initialize_auth_system`.
+
+    Raises:
+        RuntimeError: If a unique name index could not be created; seeding without
+            it would let concurrently starting workers insert duplicate roles.
+    """
+    from app.core.init_auth import initialize_auth_system
+    if ensure_indexes(mongo_client, AUTH_SEED_INDEXES):
+        raise RuntimeError('unique role/permission name indexes are missing')
+    return initialize_auth_system(mongo_client)
+
+
+def _log_index_creation(future: asyncio.Future) -> None:
+    """Logs the outcome of the background index creation."""
+    if not future.cancelled() and future.exception() is None and future.result() == 0:
+        logger.info('MongoDB indexes ensured')
+
+
+def _log_auth_initialization(future: asyncio.Future) -> None:
+    """Logs the outcome of the background authorization system initialization."""
+    if future.cancelled():
+        logger.warning('Authorization system initialization was cancelled')
+        return
+    exc = future.exception()
+    if exc is not None:
+        logger.error(f'Failed to initialize authorization system: {str(exc)}')
+    else:
+        logger.info(f'Authorization system initialized: {future.result()["status"]}')
 
 def mongodb_shutdown(app: FastAPI) -> None:
     """
@@ -59,6 +245,9 @@ def mongodb_shutdown(app: FastAPI) -> None:
     Ensures that the MongoDB connection is gracefully closed when the application stops.
     """
     logger.info('Closing the MongoDB connection...')
+    if mongo_db.batch_writer is not None:
+        mongo_db.batch_writer.close()
+        mongo_db.batch_writer = None
     app.state.mongo_client.close()
     logger.info('MondoDB connection closed! ')
 
@@ -95,22 +284,20 @@ def create_stop_app_handler(app: FastAPI) -> Callable:
 @contextmanager
 def get_mongodb():
     """
-    Context manager to get a temporary MongoDB client connection.
+    Context manager to get the MongoDB database for a specific operation.
 
-    This method creates a MongoDB client for a specific operation, yielding
-    the connection, and ensuring it is properly closed after use.
+    This method yields the configured database from the shared application
+    client. The pool is owned by the application lifecycle, so leaving the
+    context does not close any connections.
 
     Yields:
         db: The MongoDB database instance for use during the context.
     """
     try:
-        # Connect to MongoDB and get the database instance
-        with MongoClient() as client:
-            db = client["clean-database"]
-            yield db
+        yield get_database()
     except Exception as e:
         # Log the error and re-raise the exception
-        print(f'Error: {e}')
+        logger.error(f'Error: {e}')
         raise
 
 
@@ -123,10 +310,6 @@ def get_database() -> Database:
     """
     if mongo_db.client is None:
         # Initialize client if not already done
-        mongo_db.client = MongoClient(
-            MONGODB_URL,
-            MaxPoolSize=MONGODB_MAX_CONNECTIONS_COUNT,
-            MinPoolSize=MONGODB_MIN_CONNECTIONS_COUNT,
-        )
+        mongo_db.client = create_mongo_client()
     
     return mongo_db.client[MONGO_DATABASE]
\ No newline at end of file
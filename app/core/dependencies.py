@@ -1,11 +1,12 @@
+import threading
 from typing import AsyncGenerator, Callable, Type, Optional, Literal
-from fastapi import Depends, Body, HTTPException, status
+from cachetools import TTLCache
+from fastapi import Depends, Body, HTTPException, Query, status
 from fastapi.security import HTTPAuthorizationCredentials
 from pymongo import MongoClient
 import pymongo
+from starlette.concurrency import run_in_threadpool
 from starlette.requests import Request
-from pydantic import conint
-import jwt
 from jwt import InvalidTokenError
 
 from app.repository.base import BaseRepository
@@ -14,12 +15,15 @@ from app.model.user import UserDB
 from app.schema.user import (
     ListUsersResponse, DeleteUserResponse,
     CreateUserRequest, UpdateUserRequest,
-    UpdateUserResponse, TokenData, User
+    UpdateUserResponse, User
 )
 from app.core.config import (
-    MONGO_COLLECTION_USERS, SECRET_KEY, ALGORITHM, MONGODB_URL
+    MONGO_COLLECTION_USERS, MONGO_COLLECTION_STUDENT_PROFILES
+)
+from app.core.database import mongo_db, get_database
+from app.core.security import (
+    bearer_scheme, verify_password, get_password_hash, decode_access_token, credentials_exception
 )
-from app.core.security import bearer_scheme, verify_password, get_password_hash
 
 
 # ✅ Dependency: Get MongoDB client from app state
@@ -37,11 +41,50 @@ def get_mongodb_repo(repo_type: Type[BaseRepository]) -> Callable:
     return _get_repo
 
 
+# Recently fetched users keyed by username; kept short so deactivations propagate quickly
+_USER_CACHE: TTLCache = TTLCache(maxsize=5000, ttl=10)
+_USER_CACHE_LOCK = threading.RLock()
+
+
+def invalidate_cached_user(username: str) -> None:
+    """Drop a user from the lookup cache after it has been modified or deleted"""
+    with _USER_CACHE_LOCK:
+        _USER_CACHE.pop(username, None)
+
+
 # ✅ Fetch user by username (used during authentication)
-def get_user(username: str):
-    mongo_client = MongoClient(MONGODB_URL)
+def get_user(username: str, mongo_client: Optional[MongoClient] = None):
+    with _USER_CACHE_LOCK:
+        user = _USER_CACHE.get(username)
+    if user is not None:
+        return user
+
+    if mongo_client is None:
+        if mongo_db.client is None:
+            get_database()  # lazily initializes the shared client
+        mongo_client = mongo_db.client
     user_repo = UserRepository(mongo_client)
-    return user_repo.get_by_name(MONGO_COLLECTION_USERS, username)
+    user = user_repo.get_by_name(MONGO_COLLECTION_USERS, username)
+
+    if user is not None:
+        with _USER_CACHE_LOCK:
+            _USER_CACHE[username] = user
+    return user
+
+
+# ✅ Async variant of get_user for use inside coroutines
+async def get_user_async(username: str, mongo_client: Optional[MongoClient] = None):
+    """
+    Fetch a user without blocking the event loop.
+
+    Cache hits are served inline; misses run the blocking pymongo lookup in
+    the threadpool.
+    """
+    with _USER_CACHE_LOCK:
+        user = _USER_CACHE.get(username)
+    if user is not None:
+        return user
+    return await run_in_threadpool(get_user, username, mongo_client)
 
 
 # ✅ Authenticate user credentials
@@ -61,13 +104,13 @@ async def create_user_dep(
 ) -> User:
     user_in_db = UserDB(
         email=create_req.email,
-        hashed_password=get_password_hash(create_req.password),
+        hashed_password=await run_in_threadpool(get_password_hash, create_req.password),
         username=create_req.username,
         is_active=True
     )
 
     # Insert into MongoDB
-    user_created = user_repo.create(model=user_in_db, collection=MONGO_COLLECTION_USERS)
+    user_created = await run_in_threadpool(user_repo.create, model=user_in_db, collection=MONGO_COLLECTION_USERS)
 
     return User(
         user_id=str(user_created.id),
@@ -80,27 +123,70 @@ async def create_user_dep(
 
 # ✅ Extract user from JWT token
 async def get_user_dep(
-    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    mongo_client: MongoClient = Depends(_get_mongo_client)
 ):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
+    try:
+        token = credentials.credentials
+        payload = decode_access_token(token)
+        username: str = payload.get("sub")
+        if username is None:
+            raise credentials_exception()
+    except InvalidTokenError:
+        raise credentials_exception()
+
+    user = await get_user_async(username, mongo_client)
+    if user is None:
+        raise credentials_exception()
+
+    return User(
+        user_id=str(user.id),
+        email=user.email,
+        username=user.username,
+        created_at=user.created_at
     )
+
+
+# Profile fields read by the student dashboard
+DASHBOARD_PROFILE_PROJECTION = {
+    "personal_details": 1, "contact_details": 1, "address_details": 1,
+    "qualifications": 1, "interests": 1, "college_preferences": 1,
+    "profile_image_url": 1, "documents": 1,
+}
+
+
+# ✅ Extract user from JWT token and preload their student profile
+async def get_user_with_profile_dep(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    mongo_client: MongoClient = Depends(_get_mongo_client)
+) -> User:
+    """
+    Same as `get_user_dep`, but joins the student profile into the user lookup
+    so routes that need both pay a single MongoDB round trip.
+
+    The profile (or None), limited to `DASHBOARD_PROFILE_PROJECTION`, is
+    attached to `request.state.profile`.
+    """
     try:
         token = credentials.credentials
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_access_token(token)
         username: str = payload.get("sub")
         if username is None:
-            raise credentials_exception
-        token_data = TokenData(username=username)
+            raise credentials_exception()
     except InvalidTokenError:
-        raise credentials_exception
+        raise credentials_exception()
 
-    user = get_user(token_data.username)
+    user_repo = UserRepository(mongo_client)
+    user, profile = await run_in_threadpool(
+        user_repo.get_by_name_with_profile,
+        MONGO_COLLECTION_USERS, MONGO_COLLECTION_STUDENT_PROFILES, username,
+        profile_projection=DASHBOARD_PROFILE_PROJECTION
+    )
     if user is None:
-        raise credentials_exception
+        raise credentials_exception()
 
+    request.state.profile = profile
     return User(
         user_id=str(user.id),
         email=user.email,
@@ -114,7 +200,7 @@ async def get_user_id_dep(
     ID: str,
     user_repo: UserRepository = Depends(get_mongodb_repo(UserRepository))
 ) -> User:
-    user_in_db = user_repo.get_by_id(MONGO_COLLECTION_USERS, ID)
+    user_in_db = await run_in_threadpool(user_repo.get_by_id, MONGO_COLLECTION_USERS, ID)
     if user_in_db is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='User not found.')
 
@@ -127,25 +213,27 @@ async def get_user_id_dep(
     )
 
 
+# Sort options accepted by the user list endpoint
+_DEFAULT_USER_SORT = ('created_at', pymongo.DESCENDING)
+_USER_SORTS = {
+    "created_at_asc": ('created_at', pymongo.ASCENDING),
+    "created_at_desc": _DEFAULT_USER_SORT,
+    "name_asc": ('name', pymongo.ASCENDING),
+    "name_desc": ('name', pymongo.DESCENDING),
+}
+
+
 # ✅ List all users (with sorting/pagination)
 async def get_users_dep(
     sort: Literal["created_at_asc", "created_at_desc", "name_asc", "name_desc"] = None,
-    page: Optional[int] = 1,
-    limit: int = 10,
+    page: int = Query(1, ge=1),
+    limit: int = Query(10, ge=5, multiple_of=5),
     user_repo: UserRepository = Depends(get_mongodb_repo(UserRepository))
 ) -> ListUsersResponse:
-    page = conint(ge=1)(page)
-    limit = conint(ge=5, multiple_of=5)(limit)
-
-    sort_field, sort_order = 'created_at', pymongo.DESCENDING
-    if sort == "created_at_asc":
-        sort_field, sort_order = 'created_at', pymongo.ASCENDING
-    elif sort == "name_asc":
-        sort_field, sort_order = 'name', pymongo.ASCENDING
-    elif sort == "name_desc":
-        sort_field, sort_order = 'name', pymongo.DESCENDING
-
-    user_list_db, total = user_repo.get_list(
+    sort_field, sort_order = _USER_SORTS.get(sort, _DEFAULT_USER_SORT)
+
+    user_list_db, total = await run_in_threadpool(
+        user_repo.get_list,
         collection=MONGO_COLLECTION_USERS,
         sort_field=sort_field,
         sort_order=sort_order,
@@ -173,11 +261,12 @@ async def delete_user_dep(
     ID: str,
     user_repo: UserRepository = Depends(get_mongodb_repo(UserRepository))
 ):
-    user_in_db = user_repo.get_by_id(MONGO_COLLECTION_USERS, ID)
+    user_in_db = await run_in_threadpool(user_repo.get_by_id, MONGO_COLLECTION_USERS, ID)
     if user_in_db is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail='User not found.')
 
-    user_repo.delete(MONGO_COLLECTION_USERS, ID)
+    await run_in_threadpool(user_repo.delete, MONGO_COLLECTION_USERS, ID)
+    invalidate_cached_user(user_in_db.username)
     delete_user_response = DeleteUserResponse(user_id=str(user_in_db.id))
     return f"User {delete_user_response} deleted successfully."
 
@@ -188,7 +277,8 @@ async def update_user_dep(
     user_repo: UserRepository = Depends(get_mongodb_repo(UserRepository)),
     req: UpdateUserRequest = None
 ) -> UpdateUserResponse:
-    update_user = user_repo.update(MONGO_COLLECTION_USERS, id=ID, req=req)
+    update_user = await run_in_threadpool(user_repo.update, MONGO_COLLECTION_USERS, id=ID, req=req)
+    invalidate_cached_user(update_user.username)
     return UpdateUserResponse(
         user_id=str(update_user.id),
         email=update_user.email,
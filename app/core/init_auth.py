@@ -1,4 +1,5 @@
-from typing import List
+from datetime import datetime, timezone
+from typing import Dict
 from pymongo import MongoClient
 from app.core.config import (
     DEFAULT_PERMISSIONS, DEFAULT_ADMIN_ROLE, DEFAULT_USER_ROLE, DEFAULT_MODERATOR_ROLE, DEFAULT_STUDENT_ROLE,
@@ -9,11 +10,54 @@ from app.model.role import RoleDB, PermissionDB, UserRoleDB
 from app.core.security import get_password_hash
 from app.model.user import UserDB
 from app.repository.user import UserRepository
-from app.core.config import MONGO_COLLECTION_USERS
+from app.core.config import MONGO_COLLECTION_USERS, MONGO_COLLECTION_META, MONGO_DATABASE
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Sentinel document recording a completed initialization; bump the version to force a re-run
+AUTH_INIT_SENTINEL_ID = "auth_init"
+AUTH_INIT_VERSION = 1
+
+# Permission names granted to (or withheld from) the default non-admin roles
+MODERATOR_DENIED_PERMISSIONS = frozenset({"delete_users", "manage_roles"})
+USER_PERMISSIONS = frozenset({"read_users", "read_posts", "write_posts"})
+STUDENT_PERMISSIONS = frozenset({
+    "manage_profile", "upload_documents", "apply_colleges", "track_applications", "read_posts"
+})
+
+# Default role definitions; permissions are filled in per call from the stored permission IDs
+DEFAULT_ROLE_CONFIGS = (
+    {
+        "name": DEFAULT_ADMIN_ROLE,
+        "description": "Full system administrator with all permissions",
+        "is_system_role": True
+    },
+    {
+        "name": DEFAULT_MODERATOR_ROLE,
+        "description": "Moderator with limited administrative permissions",
+        "is_system_role": True
+    },
+    {
+        "name": DEFAULT_USER_ROLE,
+        "description": "Standard user with basic permissions",
+        "is_system_role": True
+    },
+    {
+        "name": DEFAULT_STUDENT_ROLE,
+        "description": "Student with profile management and application permissions",
+        "is_system_role": True
+    },
+)
+
+# Which permission names each default role receives
+ROLE_PERMISSION_FILTERS = {
+    DEFAULT_ADMIN_ROLE: lambda name: True,  # Admin gets all permissions
+    DEFAULT_MODERATOR_ROLE: lambda name: name not in MODERATOR_DENIED_PERMISSIONS,
+    DEFAULT_USER_ROLE: USER_PERMISSIONS.__contains__,
+    DEFAULT_STUDENT_ROLE: STUDENT_PERMISSIONS.__contains__,
+}
+
 
 class InitializationService:
     """Service to initialize default roles, permissions, and admin user"""
@@ -25,92 +69,65 @@ class InitializationService:
         self.user_role_repo = UserRoleRepository(mongo_client)
         self.user_repo = UserRepository(mongo_client)
     
-    def initialize_permissions(self) -> List[str]:
-        """Initialize default permissions and return their IDs"""
-        permission_ids = []
+    def is_initialized(self) -> bool:
+        """Check for the sentinel written by a completed initialization of the current version"""
+        sentinel = self.mongo_client[MONGO_DATABASE][MONGO_COLLECTION_META].find_one(
+            {"_id": AUTH_INIT_SENTINEL_ID}, {"version": 1}
+        )
+        return sentinel is not None and sentinel.get("version") == AUTH_INIT_VERSION
+    
+    def mark_initialized(self) -> None:
+        """Record that initialization of the current version has completed"""
+        self.mongo_client[MONGO_DATABASE][MONGO_COLLECTION_META].update_one(
+            {"_id": AUTH_INIT_SENTINEL_ID},
+            {"$set": {"version": AUTH_INIT_VERSION, "at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+    
+    def initialize_permissions(self) -> Dict[str, str]:
+        """Initialize default permissions and return a name -> ID mapping in DEFAULT_PERMISSIONS order"""
+        names = [perm_data.name for perm_data in DEFAULT_PERMISSIONS]
+        permission_ids_by_name = self.permission_repo.get_permission_ids_by_names(
+            MONGO_COLLECTION_PERMISSIONS,
+            names
+        )
         
-        for perm_data in DEFAULT_PERMISSIONS:
-            # Check if permission already exists
-            existing_perm = self.permission_repo.get_permission_by_name(
-                MONGO_COLLECTION_PERMISSIONS, 
-                perm_data["name"]
-            )
-            
-            if not existing_perm:
-                # Create new permission
-                permission = PermissionDB(**perm_data)
-                created_perm = self.permission_repo.create_permission(
-                    MONGO_COLLECTION_PERMISSIONS, 
-                    permission
-                )
-                permission_ids.append(str(created_perm.id))
-                logger.info(f"Created permission: {perm_data['name']}")
-            else:
-                permission_ids.append(str(existing_perm.id))
-                logger.info(f"Permission already exists: {perm_data['name']}")
+        # Create all missing permissions with a single insert
+        missing = [
+            PermissionDB(**perm_data._asdict())
+            for perm_data in DEFAULT_PERMISSIONS
+            if perm_data.name not in permission_ids_by_name
+        ]
+        created_ids = self.permission_repo.bulk_create_permissions(MONGO_COLLECTION_PERMISSIONS, missing)
+        for permission, permission_id in zip(missing, created_ids):
+            permission_ids_by_name[permission.name] = permission_id
+            logger.info(f"Created permission: {permission.name}")
+        
+        if len(missing) < len(names):
+            logger.info(f"{len(names) - len(missing)} permissions already exist")
         
-        return permission_ids
+        return {name: permission_ids_by_name[name] for name in names}
     
-    def initialize_roles(self, permission_ids: List[str]) -> dict:
+    def initialize_roles(self, permission_id_by_name: Dict[str, str]) -> dict:
         """Initialize default roles and return their IDs"""
-        role_ids = {}
-        
-        # Define role configurations
         role_configs = [
             {
-                "name": DEFAULT_ADMIN_ROLE,
-                "description": "Full system administrator with all permissions",
-                "permissions": permission_ids,  # Admin gets all permissions
-                "is_system_role": True
-            },
-            {
-                "name": DEFAULT_MODERATOR_ROLE,
-                "description": "Moderator with limited administrative permissions",
-                "permissions": [pid for pid in permission_ids if not any(
-                    perm["name"] in ["delete_users", "manage_roles"] 
-                    for perm in DEFAULT_PERMISSIONS 
-                    if str(pid) == str(pid)  # Filter out dangerous permissions
-                )],
-                "is_system_role": True
-            },
-            {
-                "name": DEFAULT_USER_ROLE,
-                "description": "Standard user with basic permissions",
-                "permissions": [pid for pid in permission_ids if any(
-                    perm["name"] in ["read_users", "read_posts", "write_posts"] 
-                    for perm in DEFAULT_PERMISSIONS 
-                    if str(pid) == str(pid)  # Basic user permissions
-                )],
-                "is_system_role": True
-            },
-            {
-                "name": DEFAULT_STUDENT_ROLE,
-                "description": "Student with profile management and application permissions",
-                "permissions": [pid for pid in permission_ids if any(
-                    perm["name"] in ["manage_profile", "upload_documents", "apply_colleges", "track_applications", "read_posts"] 
-                    for perm in DEFAULT_PERMISSIONS 
-                    if str(pid) == str(pid)  # Student permissions
-                )],
-                "is_system_role": True
+                **role_config,
+                "permissions": [pid for name, pid in permission_id_by_name.items()
+                                if ROLE_PERMISSION_FILTERS[role_config["name"]](name)]
             }
+            for role_config in DEFAULT_ROLE_CONFIGS
         ]
         
-        for role_config in role_configs:
-            # Check if role already exists
-            existing_role = self.role_repo.get_role_by_name(
-                MONGO_COLLECTION_ROLES, 
-                role_config["name"]
-            )
-            
-            if not existing_role:
-                # Create new role
-                role = RoleDB(**role_config)
-                created_role = self.role_repo.create_role(MONGO_COLLECTION_ROLES, role)
-                role_ids[role_config["name"]] = str(created_role.id)
-                logger.info(f"Created role: {role_config['name']}")
-            else:
-                role_ids[role_config["name"]] = str(existing_role.id)
-                logger.info(f"Role already exists: {role_config['name']}")
+        result = self.role_repo.bulk_upsert_roles(
+            MONGO_COLLECTION_ROLES,
+            [RoleDB(**role_config) for role_config in role_configs]
+        )
+        role_ids = result["role_ids"]
+        for name in result["created"]:
+            logger.info(f"Created role: {name}")
+        if len(result["created"]) < len(role_configs):
+            logger.info(f"{len(role_configs) - len(result['created'])} roles already exist")
         
         return role_ids
     
@@ -170,16 +187,18 @@ class InitializationService:
         
         try:
             # Step 1: Initialize permissions
-            permission_ids = self.initialize_permissions()
+            permission_id_by_name = self.initialize_permissions()
+            permission_ids = list(permission_id_by_name.values())
             logger.info(f"Initialized {len(permission_ids)} permissions")
             
             # Step 2: Initialize roles
-            role_ids = self.initialize_roles(permission_ids)
+            role_ids = self.initialize_roles(permission_id_by_name)
             logger.info(f"Initialized {len(role_ids)} roles")
             
             # Step 3: Create admin user
             admin_user = self.create_admin_user(role_ids[DEFAULT_ADMIN_ROLE])
             
+            self.mark_initialized()
             logger.info("Authorization system initialization completed successfully")
             
             return {
@@ -197,4 +216,7 @@ class InitializationService:
 def initialize_auth_system(mongo_client: MongoClient) -> dict:
     """Convenience function to initialize the authorization system"""
     service = InitializationService(mongo_client)
+    if service.is_initialized():
+        logger.info("Authorization system already initialized, skipping")
+        return {"status": "skipped"}
     return service.initialize_authorization_system()
\ No newline at end of file
@@ -5,13 +5,68 @@ This should be run once to set up the counselor authorization system.
 
 from datetime import datetime, timezone
 from app.core.database import DatabaseManager
-from app.repository.role import RoleRepository
+from app.repository.role import RoleRepository, PermissionRepository
 from app.model.role import RoleDB, PermissionDB
+from app.core import permission_cache
+from fastapi.encoders import jsonable_encoder
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+# Permissions granted to the counselor role
+COUNSELOR_PERMISSIONS = (
+    {
+        "name": "manage_leads",
+        "resource": "leads",
+        "action": "manage",
+        "description": "Full access to manage leads - view, update, reassign, quality marking"
+    },
+    {
+        "name": "view_own_profile",
+        "resource": "counselor_profile",
+        "action": "read",
+        "description": "View own counselor profile"
+    },
+    {
+        "name": "update_own_profile",
+        "resource": "counselor_profile", 
+        "action": "write",
+        "description": "Update own counselor profile, working hours, preferences"
+    },
+    {
+        "name": "log_communications",
+        "resource": "communications",
+        "action": "create",
+        "description": "Log calls and messages with leads"
+    },
+    {
+        "name": "view_dashboard",
+        "resource": "dashboard",
+        "action": "read", 
+        "description": "View counselor dashboard and statistics"
+    },
+    {
+        "name": "send_messages",
+        "resource": "messages",
+        "action": "create",
+        "description": "Send emails, SMS, WhatsApp messages to leads"
+    },
+    {
+        "name": "schedule_follow_ups",
+        "resource": "follow_ups",
+        "action": "manage",
+        "description": "Schedule and manage follow-up appointments with leads"
+    },
+    {
+        "name": "view_notifications",
+        "resource": "notifications",
+        "action": "read",
+        "description": "View counselor notifications"
+    }
+)
+
+
 def initialize_counselor_authorization():
     """Initialize counselor role and permissions"""
     try:
@@ -20,105 +75,49 @@ def initialize_counselor_authorization():
         mongo_client = database_manager.get_mongo_client()
         role_repo = RoleRepository(mongo_client)
         
-        # Define counselor permissions
-        counselor_permissions = [
-            {
-                "name": "manage_leads",
-                "resource": "leads",
-                "action": "manage",
-                "description": "Full access to manage leads - view, update, reassign, quality marking"
-            },
-            {
-                "name": "view_own_profile",
-                "resource": "counselor_profile",
-                "action": "read",
-                "description": "View own counselor profile"
-            },
-            {
-                "name": "update_own_profile",
-                "resource": "counselor_profile", 
-                "action": "write",
-                "description": "Update own counselor profile, working hours, preferences"
-            },
-            {
-                "name": "log_communications",
-                "resource": "communications",
-                "action": "create",
-                "description": "Log calls and messages with leads"
-            },
-            {
-                "name": "view_dashboard",
-                "resource": "dashboard",
-                "action": "read", 
-                "description": "View counselor dashboard and statistics"
-            },
-            {
-                "name": "send_messages",
-                "resource": "messages",
-                "action": "create",
-                "description": "Send emails, SMS, WhatsApp messages to leads"
-            },
-            {
-                "name": "schedule_follow_ups",
-                "resource": "follow_ups",
-                "action": "manage",
-                "description": "Schedule and manage follow-up appointments with leads"
-            },
-            {
-                "name": "view_notifications",
-                "resource": "notifications",
-                "action": "read",
-                "description": "View counselor notifications"
-            }
-        ]
+        # Create permissions if they don't exist, with one lookup and one insert
+        permission_repo = PermissionRepository(mongo_client)
+        names = [perm_data["name"] for perm_data in COUNSELOR_PERMISSIONS]
+        existing = {
+            (perm["name"], perm["resource"]): str(perm["_id"])
+            for perm in role_repo.database["permissions"].find(
+                {"name": {"$in": names}}, {"name": 1, "resource": 1}
+            )
+        }
         
-        # Create permissions if they don't exist
-        permission_ids = []
-        for perm_data in counselor_permissions:
-            # Check if permission already exists
-            existing_perm = role_repo.database["permissions"].find_one({
-                "name": perm_data["name"],
-                "resource": perm_data["resource"]
-            })
-            
-            if existing_perm:
-                permission_ids.append(str(existing_perm["_id"]))
-                logger.info(f"Permission {perm_data['name']} already exists")
-            else:
-                # Create new permission
-                permission = PermissionDB(**perm_data)
-                result = role_repo.create(permission.model_dump(by_alias=True), "permissions")
-                if result:
-                    permission_ids.append(str(result["_id"]))
-                    logger.info(f"Created permission: {perm_data['name']}")
-                else:
-                    logger.error(f"Failed to create permission: {perm_data['name']}")
+        missing = [
+            PermissionDB(**perm_data)
+            for perm_data in COUNSELOR_PERMISSIONS
+            if (perm_data["name"], perm_data["resource"]) not in existing
+        ]
+        created_ids = permission_repo.bulk_create_permissions("permissions", missing)
+        for permission, permission_id in zip(missing, created_ids):
+            existing[(permission.name, permission.resource)] = permission_id
+            logger.info(f"Created permission: {permission.name}")
         
-        # Create counselor role if it doesn't exist
-        existing_role = role_repo.database["roles"].find_one({"name": "counselor"})
+        permission_ids = [
+            existing[(perm_data["name"], perm_data["resource"])]
+            for perm_data in COUNSELOR_PERMISSIONS
+        ]
         
-        if existing_role:
-            logger.info("Counselor role already exists")
-            # Update permissions if needed
-            role_repo.database["roles"].update_one(
-                {"_id": existing_role["_id"]},
-                {"$set": {"permissions": permission_ids}}
-            )
-            logger.info("Updated counselor role permissions")
+        # Create the counselor role, or refresh its permissions, in one upsert
+        counselor_role = RoleDB(
+            name="counselor",
+            description="Counselor role with access to lead management, communications, and dashboard",
+            permissions=permission_ids,
+            is_system_role=True
+        )
+        role_doc = jsonable_encoder(counselor_role)
+        role_doc.pop("permissions")
+        result = role_repo.database["roles"].update_one(
+            {"name": "counselor"},
+            {"$set": {"permissions": permission_ids}, "$setOnInsert": role_doc},
+            upsert=True
+        )
+        if result.upserted_id is not None:
+            logger.info("Created counselor role successfully")
         else:
-            # Create new counselor role
-            counselor_role = RoleDB(
-                name="counselor",
-                description="Counselor role with access to lead management, communications, and dashboard",
-                permissions=permission_ids,
-                is_system_role=True
-            )
-            
-            result = role_repo.create(counselor_role.model_dump(by_alias=True), "roles")
-            if result:
-                logger.info("Created counselor role successfully")
-            else:
-                logger.error("Failed to create counselor role")
+            logger.info("Updated counselor role permissions")
         
         logger.info("Counselor authorization initialization completed")
         return True
@@ -163,6 +162,7 @@ def assign_counselor_role_to_user(user_id: str, granted_by_user_id: str):
         
         result = role_repo.create(user_role.model_dump(by_alias=True), "user_roles")
         if result:
+            permission_cache.invalidate(user_id)
             logger.info(f"Successfully assigned counselor role to user {user_id}")
             return True
         else:
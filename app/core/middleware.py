@@ -0,0 +1,43 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.core.request_cache import start_request_cache, stop_request_cache
+from app.model.base import start_request_clock, stop_request_clock
+
+
+class RequestClockMiddleware:
+    """
+    Gives each HTTP request its own `now_utc` scope, so model timestamps
+    created while handling it come from a single clock read.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = start_request_clock()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            stop_request_clock(token)
+
+
+class RequestCacheMiddleware:
+    """
+    Gives each HTTP request an empty lookup cache that is discarded when the
+    response is sent, so repeated reads within a request hit Mongo only once.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = start_request_cache()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            stop_request_cache(token)
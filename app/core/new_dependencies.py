@@ -1,27 +1,30 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from functools import lru_cache
 from typing import Optional
 import logging
-from app.core.database import get_database
+from app.core.database import get_database, mongo_db
 from app.repository.user import UserRepository
 from app.repository.student import StudentRepository
-from app.core.security import decode_access_token, check_user_permission as _check_user_permission
+from app.core.security import decode_access_token, check_user_permission as _check_user_permission, credentials_exception
 from app.model.user import UserDB
 
 logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
 
+@lru_cache(maxsize=1)
 def get_user_repository() -> UserRepository:
-    """Get user repository dependency"""
-    database = get_database()
-    return UserRepository(database)
+    """Get user repository dependency (one shared instance over the global client)"""
+    get_database()  # lazily initializes the shared client
+    return UserRepository(mongo_db.client)
 
 
+@lru_cache(maxsize=1)
 def get_student_repository() -> StudentRepository:
-    """Get student repository dependency"""
-    database = get_database()
-    return StudentRepository(database)
+    """Get student repository dependency (one shared instance over the global client)"""
+    get_database()  # lazily initializes the shared client
+    return StudentRepository(mongo_db.client)
 
 
 async def get_current_user(
@@ -29,34 +32,28 @@ async def get_current_user(
     user_repo: UserRepository = Depends(get_user_repository)
 ) -> UserDB:
     """Get current authenticated user"""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
     try:
         # Extract token from credentials
         token = credentials.credentials
         payload = decode_access_token(token)
         
         if not payload:
-            raise credentials_exception
+            raise credentials_exception()
             
         username = payload.get("sub")
         if not username:
-            raise credentials_exception
+            raise credentials_exception()
             
         # Get user from database
         user = await user_repo.get_by_username(username)
         if not user:
-            raise credentials_exception
+            raise credentials_exception()
             
         return user
         
     except Exception as e:
         logger.error(f"Authentication error: {str(e)}")
-        raise credentials_exception
+        raise credentials_exception()
 
 
 def require_permission(permission: str):
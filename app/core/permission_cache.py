@@ -0,0 +1,50 @@
+import threading
+from typing import Dict, FrozenSet, Optional
+from cachetools import TTLCache
+
+
+# Resolved role and permission names per user id, shared across requests.
+# Entries are short-lived and dropped explicitly when role assignments change.
+_ACCESS_CACHE: TTLCache = TTLCache(maxsize=50_000, ttl=30)
+_ACCESS_CACHE_LOCK = threading.Lock()
+
+
+def get_cached_access(user_id: str) -> Optional[Dict[str, FrozenSet[str]]]:
+    """
+    Returns the cached access entry for a user, if any.
+
+    Args:
+        user_id (str): The user's ID.
+
+    Returns:
+        Optional[dict]: `{"roles": frozenset, "permissions": frozenset}` or None.
+    """
+    with _ACCESS_CACHE_LOCK:
+        return _ACCESS_CACHE.get(user_id)
+
+
+def set_cached_access(user_id: str, roles, permissions) -> Dict[str, FrozenSet[str]]:
+    """
+    Stores a user's role and permission names and returns the cached entry.
+
+    Args:
+        user_id (str): The user's ID.
+        roles: Iterable of role names.
+        permissions: Iterable of permission names.
+    """
+    access = {"roles": frozenset(roles), "permissions": frozenset(permissions)}
+    with _ACCESS_CACHE_LOCK:
+        _ACCESS_CACHE[user_id] = access
+    return access
+
+
+def invalidate(user_id: str) -> None:
+    """Drops a single user's entry, e.g. after a role is assigned or removed."""
+    with _ACCESS_CACHE_LOCK:
+        _ACCESS_CACHE.pop(user_id, None)
+
+
+def invalidate_all() -> None:
+    """Drops every entry, e.g. after a role's permissions or a permission itself change."""
+    with _ACCESS_CACHE_LOCK:
+        _ACCESS_CACHE.clear()
@@ -0,0 +1,45 @@
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Dict, Hashable, Optional
+
+_MISSING = object()
+
+# Lookups memoised for the lifetime of one HTTP request; None outside a request
+_request_cache: ContextVar[Optional[Dict[Hashable, Any]]] = ContextVar("request_cache", default=None)
+
+
+def start_request_cache() -> Token:
+    """Opens an empty cache for the current request; pass the token to `stop_request_cache`."""
+    return _request_cache.set({})
+
+
+def stop_request_cache(token: Token) -> None:
+    """Discards the cache opened by `start_request_cache`."""
+    _request_cache.reset(token)
+
+
+def get_or_load(key: Hashable, loader: Callable[[], Any]) -> Any:
+    """
+    Returns the value cached under `key` for this request, calling `loader` on a miss.
+
+    Outside a request `loader` is always called. If `loader` raises, nothing is cached.
+
+    Args:
+        key (Hashable): The cache key; by convention a tuple starting with the collection name.
+        loader (Callable[[], Any]): Fetches the value on a miss.
+    """
+    cache = _request_cache.get()
+    if cache is None:
+        return loader()
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = loader()
+        cache[key] = value
+    return value
+
+
+def invalidate_collection(collection: str) -> None:
+    """Drops every entry whose key starts with `collection`, e.g. after a write to it."""
+    cache = _request_cache.get()
+    if cache:
+        for key in [k for k in cache if isinstance(k, tuple) and k and k[0] == collection]:
+            cache.pop(key, None)
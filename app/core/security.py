@@ -1,5 +1,11 @@
 from datetime import datetime, timedelta, timezone
+import hashlib
+import threading
+import time
 import jwt
+from cachetools import TTLCache
+from jwt import ExpiredSignatureError, InvalidTokenError
+from fastapi import HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from passlib.context import CryptContext
 from app.core.config import SECRET_KEY, ALGORITHM
@@ -11,6 +17,33 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # HTTPBearer for Swagger UI Bearer token authentication
 bearer_scheme = HTTPBearer()
 
+# Status, detail and headers of the 401 raised for every token/user lookup failure
+_CREDENTIALS_KWARGS = {
+    "status_code": status.HTTP_401_UNAUTHORIZED,
+    "detail": "Could not validate credentials",
+    "headers": {"WWW-Authenticate": "Bearer"},
+}
+
+# Decoded JWT payloads keyed by a digest of the raw token
+_TOKEN_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=30)
+# Recently rejected tokens, kept apart so probing with junk tokens can't evict valid entries
+_INVALID_TOKEN_CACHE: TTLCache = TTLCache(maxsize=10_000, ttl=10)
+_TOKEN_CACHE_LOCK = threading.Lock()
+
+# Decoder and options built once instead of on every decode call
+_JWT = jwt.PyJWT()
+_ALGORITHMS = [ALGORITHM]
+_DECODE_OPTIONS = {"require": ["exp", "sub"]}
+
+
+def credentials_exception() -> HTTPException:
+    """
+    Builds the 401 for a failed token/user lookup.
+
+    A new instance is returned on each call; a shared exception would have its
+    traceback and context overwritten by concurrent requests raising it.
+    """
+    return HTTPException(**_CREDENTIALS_KWARGS)
 
 
 def verify_password(plain_password, hashed_password):
@@ -62,3 +95,61 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+
+def decode_access_token(token: str) -> dict:
+    """
+    Decodes and verifies a JWT access token, caching the result for a short time.
+
+    Repeated requests with the same bearer token skip the signature check and
+    JSON parsing. The `exp` claim is still checked on every cache hit.
+
+    Args:
+        token (str): The encoded JWT access token.
+
+    Returns:
+        dict: The decoded token payload.
+
+    Raises:
+        InvalidTokenError: If the token is invalid or has expired.
+    """
+    key = _token_cache_key(token)
+    with _TOKEN_CACHE_LOCK:
+        if key in _INVALID_TOKEN_CACHE:
+            raise InvalidTokenError("Invalid token")
+        payload = _TOKEN_CACHE.get(key)
+
+    if payload is not None:
+        exp = payload.get("exp")
+        if exp is not None and exp <= time.time():
+            with _TOKEN_CACHE_LOCK:
+                _TOKEN_CACHE.pop(key, None)
+            raise ExpiredSignatureError("Signature has expired")
+        return payload
+
+    try:
+        payload = _JWT.decode(token, SECRET_KEY, algorithms=_ALGORITHMS, options=_DECODE_OPTIONS)
+    except InvalidTokenError:
+        with _TOKEN_CACHE_LOCK:
+            _INVALID_TOKEN_CACHE[key] = True
+        raise
+
+    with _TOKEN_CACHE_LOCK:
+        _TOKEN_CACHE[key] = payload
+    return payload
+
+
+def invalidate_access_token(token: str) -> None:
+    """
+    Drops a token from the decode cache, e.g. when a session is terminated.
+
+    Args:
+        token (str): The encoded JWT access token.
+    """
+    key = _token_cache_key(token)
+    with _TOKEN_CACHE_LOCK:
+        _TOKEN_CACHE.pop(key, None)
+
+
+def _token_cache_key(token: str) -> bytes:
+    """Returns a fixed-size cache key for a raw token."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
@@ -1,37 +1,45 @@
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordBearer
 from starlette.exceptions import HTTPException
 from starlette.middleware.cors import CORSMiddleware
 from app.core.exceptions import http_error_handler, http422_error_handler
 from app.api.routes import router as api_router
+from app.core.middleware import RequestCacheMiddleware, RequestClockMiddleware
 from app.core.config import ALLOWED_HOSTS, DEBUG, PROJECT_NAME, VERSION
 from app.core.database import create_start_app_handler, create_stop_app_handler
 
 
+OPENAPI_TAGS = [
+    {
+        "name": "Authentication",
+        "description": "🔐 Login and token management - get Bearer tokens for API access"
+    },
+    {
+        "name": "USER V1",
+        "description": "👤 User management and profile endpoints"
+    },
+    {
+        "name": "ADMIN V1", 
+        "description": "🛡️ Admin endpoints - roles, permissions, and user management"
+    },
+    {
+        "name": "STUDENT V1",
+        "description": "🎓 Student profile management - create and manage student profiles, qualifications, and preferences"
+    }
+]
+
+CORS_ORIGINS = list(ALLOWED_HOSTS) or ["*"]
+
+
 def get_application() -> FastAPI:
     application = FastAPI(
         title=PROJECT_NAME, 
         debug=DEBUG, 
         version=VERSION,
-        openapi_tags=[
-            {
-                "name": "Authentication",
-                "description": "🔐 Login and token management - get Bearer tokens for API access"
-            },
-            {
-                "name": "USER V1",
-                "description": "👤 User management and profile endpoints"
-            },
-            {
-                "name": "ADMIN V1", 
-                "description": "🛡️ Admin endpoints - roles, permissions, and user management"
-            },
-            {
-                "name": "STUDENT V1",
-                "description": "🎓 Student profile management - create and manage student profiles, qualifications, and preferences"
-            }
-        ]
+        openapi_tags=OPENAPI_TAGS,
+        default_response_class=ORJSONResponse
     )
 
     # Event handlers
@@ -42,18 +50,21 @@ def get_application() -> FastAPI:
     application.add_exception_handler(HTTPException, http_error_handler)
     application.add_exception_handler(RequestValidationError, http422_error_handler)
 
-    # Routers
-    application.include_router(api_router)
+    # Per-request clock for model timestamps
+    application.add_middleware(RequestClockMiddleware)
+    application.add_middleware(RequestCacheMiddleware)
 
     # CORS
     application.add_middleware(
         CORSMiddleware,
-        allow_origins=ALLOWED_HOSTS or ["*"],
+        allow_origins=CORS_ORIGINS,
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
     )
 
+    application.include_router(api_router)
+
     return application
 
 
@@ -1,9 +1,45 @@
-from typing import Any
+import re
+from contextvars import ContextVar, Token
+from datetime import datetime, timezone
+from typing import Any, Final, FrozenSet, List, Optional, get_args
 from bson import ObjectId
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from pydantic_core import core_schema
 
 
+# Matches the 24-character hex form of an ObjectId
+_is_object_id_hex = re.compile(r"[0-9a-fA-F]{24}").fullmatch
+
+# Per-request holder for the current time, set up by RequestClockMiddleware
+_request_now: ContextVar[Optional[List[Optional[datetime]]]] = ContextVar("request_now", default=None)
+
+
+def now_utc() -> datetime:
+    """
+    Returns the current UTC time, read once per request.
+
+    Inside a request every call returns the same timestamp, so models built
+    while handling it share one clock read. Outside a request it is plain
+    `datetime.now(timezone.utc)`.
+    """
+    holder = _request_now.get()
+    if holder is None:
+        return datetime.now(timezone.utc)
+    if holder[0] is None:
+        holder[0] = datetime.now(timezone.utc)
+    return holder[0]
+
+
+def start_request_clock() -> Token:
+    """Opens a request scope for `now_utc`; pass the token to `stop_request_clock`."""
+    return _request_now.set([None])
+
+
+def stop_request_clock(token: Token) -> None:
+    """Closes the request scope opened by `start_request_clock`."""
+    _request_now.reset(token)
+
+
 class PyObjectId(ObjectId):
     """Custom ObjectId field for Pydantic models"""
     
@@ -18,12 +54,13 @@ class PyObjectId(ObjectId):
 
     @classmethod
     def validate(cls, v):
-        if isinstance(v, ObjectId):
-            return str(v)
-        if isinstance(v, str):
-            if ObjectId.is_valid(v):
+        value_type = type(v)
+        if value_type is str:
+            if _is_object_id_hex(v):
                 return v
             raise ValueError("Invalid ObjectId")
+        if value_type is ObjectId or isinstance(v, ObjectId):
+            return str(v)
         raise ValueError("Invalid ObjectId type")
 
     def __repr__(self):
@@ -32,18 +69,55 @@ class PyObjectId(ObjectId):
 
 class BaseDBModel(BaseModel):
     """Base model for database entities"""
-    id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
-    
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
+    # PyObjectId validates to str, so the default is generated as a str too
+    id: PyObjectId = Field(default_factory=lambda: str(ObjectId()), alias="_id")
+
+    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
+
+
+def _is_datetime_annotation(annotation: Any) -> bool:
+    """True for `datetime` and `Optional[datetime]` field annotations."""
+    return annotation is datetime or datetime in get_args(annotation)
+
+
+class MongoModelMixin:
+    """Adds `from_mongo` to flat models read back from MongoDB"""
+
+    @classmethod
+    def _datetime_fields(cls) -> FrozenSet[str]:
+        """Names of the datetime fields, computed once per model class."""
+        fields = cls.__dict__.get("_mongo_datetime_fields")
+        if fields is None:
+            fields = frozenset(
+                name for name, field in cls.model_fields.items()
+                if _is_datetime_annotation(field.annotation)
+            )
+            cls._mongo_datetime_fields = fields
+        return fields
+
+    @classmethod
+    def from_mongo(cls, doc: dict):
+        """
+        Builds the model from a stored document without re-validating it.
+
+        Documents were validated before they were written, so this skips the
+        validators on read paths. They were also written with `jsonable_encoder`,
+        so datetime fields stored as ISO strings are parsed back to `datetime`.
+        Only use it for models without nested models, since nested values are
+        left as plain dicts.
+        """
+        values = dict(doc)
+        for name in cls._datetime_fields():
+            value = values.get(name)
+            if type(value) is str:
+                values[name] = datetime.fromisoformat(value)
+        return cls.model_construct(**values)
 
 
 class TimestampMixin(BaseModel):
     """Mixin for created_at and updated_at timestamps"""
-    created_at: Any = Field(default_factory=lambda: ObjectId().generation_time)
-    updated_at: Any = Field(default_factory=lambda: ObjectId().generation_time)
+    created_at: datetime = Field(default_factory=now_utc)
+    updated_at: datetime = Field(default_factory=now_utc)
 
 
 class Gender:
@@ -51,7 +125,4 @@ class Gender:
     MALE = "male"
     FEMALE = "female"
     OTHER = "other"
-    
-    @classmethod
-    def choices(cls):
-        return [cls.MALE, cls.FEMALE, cls.OTHER]
\ No newline at end of file
+    CHOICES: Final[FrozenSet[str]] = frozenset({MALE, FEMALE, OTHER})
\ No newline at end of file
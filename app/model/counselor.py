@@ -1,8 +1,8 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime, time
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, ConfigDict, Field
 from bson import ObjectId
-from app.model.base import PyObjectId
+from app.model.base import PyObjectId, now_utc
 from enum import Enum
 
 
@@ -17,8 +17,8 @@ class WorkingHours(BaseModel):
     sunday: Optional[Dict[str, str]] = Field(None, description="Sunday working hours")
     timezone: str = Field(default="UTC", description="Timezone")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "monday": {"start": "09:00", "end": "17:00"},
                 "tuesday": {"start": "09:00", "end": "17:00"},
@@ -29,25 +29,29 @@ class WorkingHours(BaseModel):
                 "sunday": None,
                 "timezone": "Asia/Kolkata"
             }
-        }
+        },
+        defer_build=True,
+    )
 
 
 class CounselorSpecialization(BaseModel):
     """Counselor specialization areas"""
-    countries: List[str] = Field(default=[], description="Countries of expertise")
-    courses: List[str] = Field(default=[], description="Course specializations")
-    universities: List[str] = Field(default=[], description="University partnerships")
-    languages: List[str] = Field(default=[], description="Languages spoken")
+    countries: List[str] = Field(default_factory=list, description="Countries of expertise")
+    courses: List[str] = Field(default_factory=list, description="Course specializations")
+    universities: List[str] = Field(default_factory=list, description="University partnerships")
+    languages: List[str] = Field(default_factory=list, description="Languages spoken")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "countries": ["USA", "Canada", "UK", "Australia"],
                 "courses": ["Engineering", "Business", "Computer Science"],
                 "universities": ["MIT", "Harvard", "Stanford"],
                 "languages": ["English", "Hindi", "Spanish"]
             }
-        }
+        },
+        defer_build=True,
+    )
 
 
 class CounselorPerformanceMetrics(BaseModel):
@@ -62,8 +66,8 @@ class CounselorPerformanceMetrics(BaseModel):
     follow_ups_completed: int = Field(default=0, description="Follow-ups completed")
     rating: float = Field(default=0.0, description="Average rating from students")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "total_leads": 150,
                 "active_leads": 25,
@@ -75,7 +79,9 @@ class CounselorPerformanceMetrics(BaseModel):
                 "follow_ups_completed": 120,
                 "rating": 4.5
             }
-        }
+        },
+        defer_build=True,
+    )
 
 
 class CounselorStatus(str, Enum):
@@ -88,7 +94,7 @@ class CounselorStatus(str, Enum):
 
 class CounselorProfileDB(BaseModel):
     """Counselor profile stored in database"""
-    id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
+    id: Optional[PyObjectId] = Field(default_factory=lambda: str(ObjectId()), alias="_id")
     user_id: PyObjectId = Field(..., description="Reference to User ID")
     
     # Personal Information
@@ -126,15 +132,15 @@ class CounselorProfileDB(BaseModel):
     profile_image_url: Optional[str] = Field(None, description="Profile image S3 URL")
     
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=now_utc)
+    updated_at: datetime = Field(default_factory=now_utc)
     last_login: Optional[datetime] = Field(None, description="Last login time")
     
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
-        json_schema_extra = {
+    model_config = ConfigDict(
+        populate_by_name=True,
+        arbitrary_types_allowed=True,
+        json_encoders={ObjectId: str},
+        json_schema_extra={
             "example": {
                 "user_id": "507f1f77bcf86cd799439011",
                 "first_name": "John",
@@ -147,7 +153,9 @@ class CounselorProfileDB(BaseModel):
                 "status": "active",
                 "is_available": True
             }
-        }
+        },
+        defer_build=True,
+    )
 
 
 # Lead Management Models
@@ -199,13 +207,21 @@ class MessageType(str, Enum):
     NOTE = "note"
 
 
+class LeadNoteEntry(BaseModel):
+    """A note left on a lead by its counselor"""
+    ts: datetime = Field(default_factory=now_utc, description="When the note was added")
+    by: PyObjectId = Field(..., description="Counselor who added the note")
+    text: str = Field(..., description="Note text")
+
+
 class LeadDB(BaseModel):
     """Lead information in database"""
-    id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
+    id: Optional[PyObjectId] = Field(default_factory=lambda: str(ObjectId()), alias="_id")
     
     # Student Information
     student_id: PyObjectId = Field(..., description="Reference to Student ID")
     student_name: str = Field(..., description="Student name")
+    # Already validated by the request schemas on ingress, so stored as a plain str
     student_email: str = Field(..., description="Student email")
     student_phone: str = Field(..., description="Student phone")
     
@@ -221,39 +237,39 @@ class LeadDB(BaseModel):
     assigned_by: Optional[PyObjectId] = Field(None, description="Assigned by user")
     
     # Student Preferences
-    preferred_countries: List[str] = Field(default=[], description="Preferred countries")
-    preferred_courses: List[str] = Field(default=[], description="Preferred courses")
-    preferred_cities: List[str] = Field(default=[], description="Preferred cities")
+    preferred_countries: List[str] = Field(default_factory=list, description="Preferred countries")
+    preferred_courses: List[str] = Field(default_factory=list, description="Preferred courses")
+    preferred_cities: List[str] = Field(default_factory=list, description="Preferred cities")
     budget_range: Optional[Dict[str, float]] = Field(None, description="Budget range")
     intake_term: Optional[str] = Field(None, description="Preferred intake term")
     
     # Communication History
     last_contact_date: Optional[datetime] = Field(None)
     next_follow_up: Optional[datetime] = Field(None)
-    total_calls: int = Field(default=0)
-    total_emails: int = Field(default=0)
-    total_messages: int = Field(default=0)
+    # Call/message totals are derived from the call_logs and message_logs collections
     
     # Notes and Comments
-    notes: List[str] = Field(default=[], description="General notes")
+    notes: List[LeadNoteEntry] = Field(default_factory=list, description="Most recent notes; the full history is in lead_notes")
     
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
-    
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
+    created_at: datetime = Field(default_factory=now_utc)
+    updated_at: datetime = Field(default_factory=now_utc)
+    
+    model_config = ConfigDict(
+        populate_by_name=True,
+        arbitrary_types_allowed=True,
+        json_encoders={ObjectId: str},
+        defer_build=True,
+    )
 
 
 class CallLogDB(BaseModel):
     """Call log entry"""
-    id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
+    id: Optional[PyObjectId] = Field(default_factory=lambda: str(ObjectId()), alias="_id")
     lead_id: PyObjectId = Field(..., description="Reference to Lead")
     counselor_id: PyObjectId = Field(..., description="Reference to Counselor")
     
-    call_date: datetime = Field(default_factory=datetime.utcnow)
+    call_date: datetime = Field(default_factory=now_utc)
     duration_minutes: int = Field(default=0, description="Call duration in minutes")
     outcome: CallOutcome = Field(..., description="Call outcome")
     notes: str = Field(default="", description="Call notes")
@@ -264,15 +280,17 @@ class CallLogDB(BaseModel):
     phone_number: str = Field(..., description="Phone number called")
     call_type: str = Field(default="outbound", description="Call type")
     
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
+    model_config = ConfigDict(
+        populate_by_name=True,
+        arbitrary_types_allowed=True,
+        json_encoders={ObjectId: str},
+        defer_build=True,
+    )
 
 
 class MessageLogDB(BaseModel):
     """Message/communication log"""
-    id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
+    id: Optional[PyObjectId] = Field(default_factory=lambda: str(ObjectId()), alias="_id")
     lead_id: PyObjectId = Field(..., description="Reference to Lead")
     counselor_id: PyObjectId = Field(..., description="Reference to Counselor")
     
@@ -281,7 +299,7 @@ class MessageLogDB(BaseModel):
     content: str = Field(..., description="Message content")
     recipient: str = Field(..., description="Recipient (email/phone)")
     
-    sent_at: datetime = Field(default_factory=datetime.utcnow)
+    sent_at: datetime = Field(default_factory=now_utc)
     delivered: bool = Field(default=False)
     read: bool = Field(default=False)
     response_received: bool = Field(default=False)
@@ -289,15 +307,23 @@ class MessageLogDB(BaseModel):
     # Template information
     template_used: Optional[str] = Field(None, description="Template ID used")
     
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
+    model_config = ConfigDict(
+        populate_by_name=True,
+        arbitrary_types_allowed=True,
+        json_encoders={ObjectId: str},
+        defer_build=True,
+    )
+
+
+class RelatedRef(BaseModel):
+    """Reference from a notification to the object it is about"""
+    type: Literal["lead", "application", "document"] = Field(..., description="Type of related object")
+    id: PyObjectId = Field(..., description="Related object ID")
 
 
 class NotificationDB(BaseModel):
     """Notification for counselor"""
-    id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
+    id: Optional[PyObjectId] = Field(default_factory=lambda: str(ObjectId()), alias="_id")
     counselor_id: PyObjectId = Field(..., description="Reference to Counselor")
     
     title: str = Field(..., description="Notification title")
@@ -305,10 +331,8 @@ class NotificationDB(BaseModel):
     type: str = Field(..., description="Notification type")
     priority: str = Field(default="medium", description="Priority level")
     
-    # Related objects
-    related_lead_id: Optional[PyObjectId] = Field(None, description="Related lead")
-    related_object_type: Optional[str] = Field(None, description="Type of related object")
-    related_object_id: Optional[PyObjectId] = Field(None, description="Related object ID")
+    # Related object
+    related: Optional[RelatedRef] = Field(None, description="Object this notification refers to")
     
     # Status
     read: bool = Field(default=False)
@@ -319,10 +343,12 @@ class NotificationDB(BaseModel):
     action_url: Optional[str] = Field(None, description="URL for action")
     
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=now_utc)
     expires_at: Optional[datetime] = Field(None, description="Notification expiry")
     
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
\ No newline at end of file
+    model_config = ConfigDict(
+        populate_by_name=True,
+        arbitrary_types_allowed=True,
+        json_encoders={ObjectId: str},
+        defer_build=True,
+    )
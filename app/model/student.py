@@ -1,8 +1,8 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict
 from datetime import datetime
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, ConfigDict, Field
 from bson import ObjectId
-from app.model.base import PyObjectId
+from app.model.base import PyObjectId, now_utc
 
 
 class AcademicQualification(BaseModel):
@@ -10,13 +10,13 @@ class AcademicQualification(BaseModel):
     level: str = Field(..., description="Education level (e.g., '10th', '12th', 'Bachelor', 'Master')")
     institution: str = Field(..., description="Name of the institution")
     board_university: str = Field(..., description="Board/University name")
-    subjects: List[str] = Field(default=[], description="Subjects studied")
+    subjects: List[str] = Field(default_factory=list, description="Subjects studied")
     percentage_cgpa: float = Field(..., description="Percentage or CGPA obtained")
     year_of_passing: int = Field(..., description="Year of passing/completion")
-    documents: List[str] = Field(default=[], description="Document URLs in S3")
+    documents: List[str] = Field(default_factory=list, description="Document URLs in S3")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "level": "12th",
                 "institution": "ABC School",
@@ -26,7 +26,9 @@ class AcademicQualification(BaseModel):
                 "year_of_passing": 2023,
                 "documents": ["s3://bucket/certificates/12th_certificate.pdf"]
             }
-        }
+        },
+        defer_build=True,
+    )
 
 
 class CollegePreference(BaseModel):
@@ -38,8 +40,8 @@ class CollegePreference(BaseModel):
     application_status: str = Field(default="not_applied", description="Application status")
     entrance_exam: Optional[str] = Field(None, description="Required entrance exam")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "college_name": "IIT Delhi",
                 "course_name": "Computer Science Engineering",
@@ -48,7 +50,9 @@ class CollegePreference(BaseModel):
                 "application_status": "applied",
                 "entrance_exam": "JEE Main"
             }
-        }
+        },
+        defer_build=True,
+    )
 
 
 class PersonalDetails(BaseModel):
@@ -62,8 +66,8 @@ class PersonalDetails(BaseModel):
     religion: Optional[str] = Field(None, description="Religion")
     blood_group: Optional[str] = Field(None, description="Blood group")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "father_name": "John Doe Sr.",
                 "mother_name": "Jane Doe",
@@ -74,7 +78,9 @@ class PersonalDetails(BaseModel):
                 "religion": "Hindu",
                 "blood_group": "O+"
             }
-        }
+        },
+        defer_build=True,
+    )
 
 
 class AddressDetails(BaseModel):
@@ -86,8 +92,8 @@ class AddressDetails(BaseModel):
     pincode: str = Field(..., description="PIN code")
     country: str = Field(default="India", description="Country")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "permanent_address": "123 Main St, Sector 1",
                 "current_address": "123 Main St, Sector 1",
@@ -96,7 +102,9 @@ class AddressDetails(BaseModel):
                 "pincode": "110001",
                 "country": "India"
             }
-        }
+        },
+        defer_build=True,
+    )
 
 
 class ContactDetails(BaseModel):
@@ -106,20 +114,58 @@ class ContactDetails(BaseModel):
     emergency_contact: str = Field(..., description="Emergency contact number")
     emergency_contact_relation: str = Field(..., description="Emergency contact relation")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "mobile": "+91-9876543210",
                 "alternate_mobile": "+91-9876543211",
                 "emergency_contact": "+91-9876543212",
                 "emergency_contact_relation": "Father"
             }
-        }
+        },
+        defer_build=True,
+    )
+
+
+class ApplicationRecord(BaseModel):
+    """College application submitted by the student"""
+    college_id: PyObjectId = Field(..., description="Reference to the college")
+    status: str = Field(default="submitted", description="Application status")
+    submitted_at: datetime = Field(default_factory=now_utc, description="Submission time")
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "college_id": "507f1f77bcf86cd799439011",
+                "status": "submitted",
+                "submitted_at": "2025-01-15T10:30:00Z"
+            }
+        },
+        defer_build=True,
+    )
+
+
+class EntranceExamRecord(BaseModel):
+    """Entrance exam taken or scheduled by the student"""
+    name: str = Field(..., description="Exam name (e.g., 'JEE Main', 'NEET')")
+    score: Optional[float] = Field(None, description="Score, once results are out")
+    scheduled_on: Optional[datetime] = Field(None, description="Exam date")
+    
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "name": "JEE Main",
+                "score": 98.5,
+                "scheduled_on": "2025-04-06T09:00:00Z"
+            }
+        },
+        defer_build=True,
+    )
 
 
 class StudentProfileDB(BaseModel):
     """Student profile stored in database"""
-    id: Optional[PyObjectId] = Field(default_factory=PyObjectId, alias="_id")
+    id: Optional[PyObjectId] = Field(default_factory=lambda: str(ObjectId()), alias="_id")
     user_id: PyObjectId = Field(..., description="Reference to User ID")
     
     # Profile completion status
@@ -132,31 +178,31 @@ class StudentProfileDB(BaseModel):
     contact_details: Optional[ContactDetails] = Field(None, description="Contact details")
     
     # Academic information
-    qualifications: List[AcademicQualification] = Field(default=[], description="Academic qualifications")
+    qualifications: List[AcademicQualification] = Field(default_factory=list, description="Academic qualifications")
     current_education_level: Optional[str] = Field(None, description="Current education level")
     
     # Interests and preferences
-    interests: List[str] = Field(default=[], description="Academic/career interests")
+    interests: List[str] = Field(default_factory=list, description="Academic/career interests")
     career_goals: Optional[str] = Field(None, description="Career goals description")
-    college_preferences: List[CollegePreference] = Field(default=[], description="College preferences")
+    college_preferences: List[CollegePreference] = Field(default_factory=list, description="College preferences")
     
     # Media files
     profile_image_url: Optional[str] = Field(None, description="Profile image S3 URL")
-    documents: Dict[str, List[str]] = Field(default={}, description="Document URLs by category")
+    documents: Dict[str, List[str]] = Field(default_factory=dict, description="Document URLs by category")
     
     # Application tracking
-    applications_submitted: List[Dict[str, Any]] = Field(default=[], description="Submitted applications")
-    entrance_exams: List[Dict[str, Any]] = Field(default=[], description="Entrance exam details")
+    applications_submitted: List[ApplicationRecord] = Field(default_factory=list, description="Submitted applications")
+    entrance_exams: List[EntranceExamRecord] = Field(default_factory=list, description="Entrance exam details")
     
     # Timestamps
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=now_utc)
+    updated_at: datetime = Field(default_factory=now_utc)
     
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
-        json_schema_extra = {
+    model_config = ConfigDict(
+        populate_by_name=True,
+        arbitrary_types_allowed=True,
+        json_encoders={ObjectId: str},
+        json_schema_extra={
             "example": {
                 "user_id": "507f1f77bcf86cd799439011",
                 "profile_completed": False,
@@ -165,7 +211,9 @@ class StudentProfileDB(BaseModel):
                 "career_goals": "Become a software engineer at a top tech company",
                 "current_education_level": "12th"
             }
-        }
+        },
+        defer_build=True,
+    )
 
 
 class StudentQualificationCreate(BaseModel):
@@ -173,7 +221,7 @@ class StudentQualificationCreate(BaseModel):
     level: str
     institution: str
     board_university: str
-    subjects: List[str] = []
+    subjects: List[str] = Field(default_factory=list)
     percentage_cgpa: float
     year_of_passing: int
 
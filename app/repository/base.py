@@ -1,7 +1,23 @@
+from typing import Dict, Type
+from pydantic import BaseModel
 from pymongo import MongoClient
 from app.core.config import MONGO_DATABASE
+from app.core.database import mongo_db
+from app.repository.batch import WriteOp
 
 
+def projection_for(model: Type[BaseModel]) -> Dict[str, int]:
+    """
+    Builds a MongoDB projection that returns only the fields a model reads.
+
+    Args:
+        model (Type[BaseModel]): The model documents will be loaded into.
+
+    Returns:
+        Dict[str, int]: An inclusion projection keyed by each field's alias or name.
+    """
+    return {field.alias or name: 1 for name, field in model.model_fields.items()}
+
 
 class BaseRepository:
     """
@@ -28,3 +44,21 @@ class BaseRepository:
             MongoClient: The MongoDB client instance.
         """
         return self._mongo
+
+
+    def queue_write(self, collection: str, op: WriteOp) -> None:
+        """
+        Hands a fire-and-forget write to the application's batch writer.
+
+        Falls back to applying the operation immediately when no batch writer is
+        running for this repository's client (e.g. scripts outside the app lifecycle).
+
+        Args:
+            collection (str): The collection the operation targets.
+            op (WriteOp): An `InsertOne` or `UpdateOne` operation.
+        """
+        writer = mongo_db.batch_writer
+        if writer is not None and writer.database.client is self._mongo:
+            writer.submit(collection, op)
+        else:
+            self.database[collection].bulk_write([op], ordered=False)
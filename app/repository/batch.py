@@ -0,0 +1,83 @@
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, List, Union
+from pymongo import InsertOne, UpdateOne
+from pymongo.database import Database
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+WriteOp = Union[InsertOne, UpdateOne]
+
+
+class BatchProcessor:
+    """
+    Write-behind queue that groups fire-and-forget writes into `bulk_write` calls.
+
+    Operations are buffered per collection and flushed by a background thread every
+    `flush_interval_ms`, or sooner once `max_ops` operations are waiting. Writes
+    are unordered, so one failing operation doesn't hold back the rest of its batch.
+
+    Queued writes are not durable: failed bulk writes are logged, not retried, and
+    anything still queued when the process dies is lost. Only use it for writes
+    the caller can afford to drop.
+
+    Attributes:
+        database (Database): The database the queued operations are applied to.
+    """
+    def __init__(self, database: Database, max_ops: int = 500, flush_interval_ms: int = 50):
+        self.database = database
+        self._max_ops = max_ops
+        self._interval = flush_interval_ms / 1000
+        self._pending: Dict[str, List[WriteOp]] = defaultdict(list)
+        self._queued = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="mongo-batch-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, collection: str, op: WriteOp) -> None:
+        """
+        Queues a write for the next flush.
+
+        Args:
+            collection (str): The collection the operation targets.
+            op (WriteOp): An `InsertOne` or `UpdateOne` operation.
+        """
+        with self._lock:
+            self._pending[collection].append(op)
+            self._queued += 1
+            full = self._queued >= self._max_ops
+        if full:
+            self._wakeup.set()
+
+    def flush(self) -> None:
+        """Applies every queued operation, one `bulk_write` per collection."""
+        with self._lock:
+            if not self._queued:
+                return
+            pending, self._pending = self._pending, defaultdict(list)
+            self._queued = 0
+        for collection, ops in pending.items():
+            try:
+                self.database[collection].bulk_write(ops, ordered=False)
+            except BulkWriteError as e:
+                logger.error(f"Batched write to {collection} partially failed: "
+                             f"{len(e.details.get('writeErrors', []))} of {len(ops)} operations rejected")
+            except Exception as e:
+                logger.error(f"Batched write of {len(ops)} operations to {collection} failed: {str(e)}")
+
+    def close(self) -> None:
+        """Stops the background thread and flushes whatever is still queued."""
+        self._stopped.set()
+        self._wakeup.set()
+        self._thread.join()
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self._interval)
+            self._wakeup.clear()
+            self.flush()
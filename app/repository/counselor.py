@@ -1,6 +1,11 @@
-from pymongo import MongoClient
-from typing import Optional, Dict, Any, List
+from pymongo import InsertOne, MongoClient, ReadPreference
+from pymongo.errors import OperationFailure
+from typing import Optional, Dict, Any, Callable, Iterator, List
 from datetime import datetime, timedelta
+from app.core import request_cache
+from app.core.database import (
+    LEADS_BY_COUNSELOR_INDEX, LEADS_BY_COUNSELOR_STATUS_INDEX, LEADS_BY_COUNSELOR_QUALITY_INDEX
+)
 from app.repository.base import BaseRepository
 from app.model.counselor import (
     CounselorProfileDB, LeadDB, CallLogDB, MessageLogDB, NotificationDB,
@@ -11,6 +16,49 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Notes kept inline on a lead document; the full history lives in the archive collection
+LEAD_RECENT_NOTES_LIMIT = 20
+# search_leads filter name -> (field, condition) for the lead query
+LEAD_SEARCH_FILTERS = {
+    "status": lambda value: ("status", value),
+    "quality": lambda value: ("quality", value),
+    "priority": lambda value: ("priority", value),
+    "country": lambda value: ("preferred_countries", {"$in": [value]}),
+    "course": lambda value: ("preferred_courses", {"$in": [value]}),
+}
+# Per-counselor lead status counts, kept in step with every status change
+LEAD_STATUS_COUNTERS_COLLECTION = "lead_status_counters"
+# Server error code for transactions on a standalone mongod
+ILLEGAL_OPERATION_CODE = 20
+# Server error code (BadValue) and message for a hint naming an index that doesn't exist
+BAD_VALUE_CODE = 2
+MISSING_HINT_MESSAGE = "hint provided does not correspond to an existing index"
+# Call logs per round trip when streaming a counselor's call history
+CALL_LOG_BATCH_SIZE = 200
+
+
+def lead_index_hint(query: Dict[str, Any]) -> Dict[str, int]:
+    """Picks the counselor lead index whose equality prefix matches the query, as a hint document"""
+    if "status" in query:
+        return dict(LEADS_BY_COUNSELOR_STATUS_INDEX)
+    if "quality" in query:
+        return dict(LEADS_BY_COUNSELOR_QUALITY_INDEX)
+    return dict(LEADS_BY_COUNSELOR_INDEX)
+
+
+def run_with_index_hint(run: Callable[[Optional[Dict[str, int]]], Any], hint: Dict[str, int]) -> Any:
+    """
+    Runs a query with an index hint, retrying unhinted if the server has no such index
+    (e.g. while startup index creation is still in progress, or if it failed).
+    """
+    try:
+        return run(hint)
+    except OperationFailure as e:
+        if e.code != BAD_VALUE_CODE or MISSING_HINT_MESSAGE not in (e.details or {}).get("errmsg", ""):
+            raise
+        logger.warning(f"Index hint {hint} unavailable, retrying without it: {str(e)}")
+        return run(None)
+
 
 class CounselorRepository(BaseRepository):
     """Repository for counselor profile operations"""
@@ -19,9 +67,12 @@ class CounselorRepository(BaseRepository):
         super().__init__(mongo_client)
     
     def get_profile_by_user_id(self, collection: str, user_id: str) -> Optional[Dict[str, Any]]:
-        """Get counselor profile by user ID"""
+        """Get counselor profile by user ID, cached for the rest of the request"""
         try:
-            return self.get_by_field(collection, "user_id", user_id)
+            return request_cache.get_or_load(
+                (collection, "user_id", user_id),
+                lambda: self.database[collection].find_one({"user_id": user_id})
+            )
         except Exception as e:
             logger.error(f"Error getting counselor profile: {str(e)}")
             return None
@@ -30,35 +81,56 @@ class CounselorRepository(BaseRepository):
         """Create new counselor profile"""
         try:
             profile_data["user_id"] = user_id
-            result = self.create(profile_data, collection)
-            return result
+            profile_data.setdefault("_id", str(ObjectId()))
+            self.database[collection].insert_one(profile_data)
+            request_cache.invalidate_collection(collection)
+            return profile_data
         except Exception as e:
             logger.error(f"Error creating counselor profile: {str(e)}")
             return None
     
     def update_profile(self, collection: str, user_id: str, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Update counselor profile"""
+        """Update counselor profile and return it as stored after the update"""
         try:
-            profile = self.get_profile_by_user_id(collection, user_id)
-            if not profile:
-                return None
-            
-            update_data["updated_at"] = datetime.utcnow()
-            self.update_by_field(collection, "user_id", user_id, update_data)
+            # Plain fields are $set; update operators such as $inc pass through as-is
+            update = {key: value for key, value in update_data.items() if key.startswith("$")}
+            update["$set"] = {
+                **update.get("$set", {}),
+                **{key: value for key, value in update_data.items() if not key.startswith("$")},
+                "updated_at": datetime.utcnow()
+            }
             
-            return self.get_profile_by_user_id(collection, user_id)
+            profile = self.database[collection].find_one_and_update(
+                {"user_id": user_id},
+                update,
+                return_document=True
+            )
+            request_cache.invalidate_collection(collection)
+            return profile
         except Exception as e:
             logger.error(f"Error updating counselor profile: {str(e)}")
             return None
     
     def get_counselor_by_id(self, collection: str, counselor_id: str) -> Optional[Dict[str, Any]]:
-        """Get counselor by ID"""
+        """Get counselor by ID, cached for the rest of the request"""
         try:
-            return self.get_by_id(collection, counselor_id)
+            return request_cache.get_or_load(
+                (collection, "_id", counselor_id),
+                lambda: self.database[collection].find_one({"_id": counselor_id})
+            )
         except Exception as e:
             logger.error(f"Error getting counselor by ID: {str(e)}")
             return None
     
+    def get_counselors_by_ids(self, collection: str, counselor_ids: List[str],
+                              projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Get the counselors matching a list of IDs in one query"""
+        try:
+            return list(self.database[collection].find({"_id": {"$in": list(counselor_ids)}}, projection))
+        except Exception as e:
+            logger.error(f"Error getting counselors by IDs: {str(e)}")
+            return []
+    
     def get_available_counselors(self, collection: str) -> List[Dict[str, Any]]:
         """Get all available counselors for lead assignment"""
         try:
@@ -93,6 +165,7 @@ class CounselorRepository(BaseRepository):
                 {"_id": counselor_id},
                 {"$set": update_data}
             )
+            request_cache.invalidate_collection(collection)
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Error updating counselor status: {str(e)}")
@@ -105,10 +178,49 @@ class CounselorRepository(BaseRepository):
                 {"_id": counselor_id},
                 {"$set": {"performance_metrics": metrics, "updated_at": datetime.utcnow()}}
             )
+            request_cache.invalidate_collection(collection)
             return result.modified_count > 0
         except Exception as e:
             logger.error(f"Error updating performance metrics: {str(e)}")
             return False
+    
+    def increment_metric(self, collection: str, counselor_id: str, metric_name: str, delta: float = 1) -> bool:
+        """Atomically add `delta` to a single performance metric"""
+        try:
+            result = self.database[collection].update_one(
+                {"_id": counselor_id},
+                {
+                    "$inc": {f"performance_metrics.{metric_name}": delta},
+                    "$set": {"updated_at": datetime.utcnow()}
+                }
+            )
+            request_cache.invalidate_collection(collection)
+            return result.modified_count > 0
+        except Exception as e:
+            logger.error(f"Error incrementing performance metric {metric_name}: {str(e)}")
+            return False
+    
+    def record_call_metrics(self, collection: str, counselor_id: str, duration_minutes: float) -> bool:
+        """Count a call and fold its duration into the running average in one atomic update"""
+        try:
+            calls = {"$ifNull": ["$performance_metrics.total_calls_made", 0]}
+            average = {"$ifNull": ["$performance_metrics.average_call_duration", 0]}
+            result = self.database[collection].update_one(
+                {"_id": counselor_id},
+                [{"$set": {
+                    "performance_metrics.total_calls_made": {"$add": [calls, 1]},
+                    "performance_metrics.average_call_duration": {"$round": [
+                        {"$divide": [{"$add": [{"$multiply": [average, calls]}, duration_minutes]}, {"$add": [calls, 1]}]},
+                        2
+                    ]},
+                    "updated_at": datetime.utcnow()
+                }}]
+            )
+            request_cache.invalidate_collection(collection)
+            return result.modified_count > 0
+        except Exception as e:
+            logger.error(f"Error recording call metrics: {str(e)}")
+            return False
 
 
 class LeadRepository(BaseRepository):
@@ -117,24 +229,55 @@ class LeadRepository(BaseRepository):
     def __init__(self, mongo_client: MongoClient):
         super().__init__(mongo_client)
     
+    def _adjust_status_counts(self, counselor_id: Optional[str], deltas: Dict[str, int], session=None) -> None:
+        """Apply status count deltas to a counselor's counters document, creating it if needed"""
+        deltas = {status: delta for status, delta in deltas.items() if status and delta}
+        if not counselor_id or not deltas:
+            return
+        self.database[LEAD_STATUS_COUNTERS_COLLECTION].update_one(
+            {"_id": counselor_id},
+            {
+                "$inc": {f"status_counts.{status}": delta for status, delta in deltas.items()},
+                "$set": {"updated_at": datetime.utcnow()}
+            },
+            upsert=True,
+            session=session
+        )
+    
+    def rebuild_status_counters(self, collection: str) -> None:
+        """Recompute every counselor's status counters document from their leads"""
+        pipeline = [
+            {"$match": {"assigned_counselor_id": {"$ne": None}, "status": {"$type": "string"}}},
+            {"$group": {"_id": {"counselor_id": "$assigned_counselor_id", "status": "$status"}, "n": {"$sum": 1}}},
+            {"$group": {"_id": "$_id.counselor_id", "counts": {"$push": {"k": "$_id.status", "v": "$n"}}}},
+            {"$project": {"status_counts": {"$arrayToObject": "$counts"}, "updated_at": {"$literal": datetime.utcnow()}}},
+            {"$merge": {"into": LEAD_STATUS_COUNTERS_COLLECTION, "whenMatched": "replace", "whenNotMatched": "insert"}}
+        ]
+        self.database[collection].aggregate(pipeline)
+    
     def create_lead(self, collection: str, lead_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Create new lead"""
         try:
-            result = self.create(lead_data, collection)
-            return result
+            lead_data.setdefault("_id", str(ObjectId()))
+            self.database[collection].insert_one(lead_data)
+            self._adjust_status_counts(lead_data.get("assigned_counselor_id"), {lead_data.get("status"): 1})
+            return lead_data
         except Exception as e:
             logger.error(f"Error creating lead: {str(e)}")
             return None
     
-    def get_leads_by_counselor(self, collection: str, counselor_id: str, status: str = None) -> List[Dict[str, Any]]:
+    def get_leads_by_counselor(self, collection: str, counselor_id: str, status: str = None,
+                               projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Get leads assigned to a counselor"""
         try:
             query = {"assigned_counselor_id": counselor_id}
             if status:
                 query["status"] = status
             
-            leads = self.database[collection].find(query).sort("created_at", -1)
-            return list(leads)
+            return run_with_index_hint(
+                lambda hint: list(self.database[collection].find(query, projection).hint(hint).sort("created_at", -1)),
+                lead_index_hint(query)
+            )
         except Exception as e:
             logger.error(f"Error getting leads by counselor: {str(e)}")
             return []
@@ -142,7 +285,7 @@ class LeadRepository(BaseRepository):
     def get_lead_by_id(self, collection: str, lead_id: str) -> Optional[Dict[str, Any]]:
         """Get lead by ID"""
         try:
-            return self.get_by_id(collection, lead_id)
+            return self.database[collection].find_one({"_id": lead_id})
         except Exception as e:
             logger.error(f"Error getting lead by ID: {str(e)}")
             return None
@@ -156,12 +299,16 @@ class LeadRepository(BaseRepository):
                 "last_contact_date": datetime.utcnow()
             }
             
-            result = self.database[collection].find_one_and_update(
+            # The pre-update document tells us which status count to move the lead out of
+            previous = self.database[collection].find_one_and_update(
                 {"_id": lead_id, "assigned_counselor_id": counselor_id},
-                {"$set": update_data},
-                return_document=True
+                {"$set": update_data}
             )
-            return result
+            if previous is None:
+                return None
+            if previous.get("status") != status:
+                self._adjust_status_counts(counselor_id, {previous.get("status"): -1, status: 1})
+            return {**previous, **update_data}
         except Exception as e:
             logger.error(f"Error updating lead status: {str(e)}")
             return None
@@ -184,8 +331,9 @@ class LeadRepository(BaseRepository):
             logger.error(f"Error marking lead quality: {str(e)}")
             return None
     
-    def reassign_lead(self, collection: str, lead_id: str, new_counselor_id: str, current_counselor_id: str) -> Optional[Dict[str, Any]]:
-        """Reassign lead to another counselor"""
+    def reassign_lead(self, collection: str, lead_id: str, new_counselor_id: str, current_counselor_id: str,
+                      counselor_collection: str = "counselor_profiles") -> Optional[Dict[str, Any]]:
+        """Reassign lead to another counselor, moving it between their lead and status counts (in one transaction where supported)"""
         try:
             update_data = {
                 "assigned_counselor_id": new_counselor_id,
@@ -194,49 +342,84 @@ class LeadRepository(BaseRepository):
                 "status": "reassigned"
             }
             
-            result = self.database[collection].find_one_and_update(
-                {"_id": lead_id, "assigned_counselor_id": current_counselor_id},
-                {"$set": update_data},
-                return_document=True
-            )
+            def reassign(session):
+                previous = self.database[collection].find_one_and_update(
+                    {"_id": lead_id, "assigned_counselor_id": current_counselor_id},
+                    {"$set": update_data},
+                    session=session
+                )
+                if previous is None:
+                    return None
+                self._adjust_status_counts(current_counselor_id, {previous.get("status"): -1}, session)
+                self._adjust_status_counts(new_counselor_id, {update_data["status"]: 1}, session)
+                counselors = self.database[counselor_collection]
+                if current_counselor_id:
+                    counselors.update_one(
+                        {"_id": current_counselor_id, "current_leads_count": {"$gt": 0}},
+                        {"$inc": {"current_leads_count": -1}},
+                        session=session
+                    )
+                counselors.update_one(
+                    {"_id": new_counselor_id},
+                    {"$inc": {"current_leads_count": 1}},
+                    session=session
+                )
+                return {**previous, **update_data}
+            
+            try:
+                with self._mongo.start_session() as session:
+                    result = session.with_transaction(reassign)
+            except OperationFailure as e:
+                # Standalone servers reject transactions before anything is written; the lead
+                # update is atomic by itself and the counters follow as conditional $inc updates
+                if e.code != ILLEGAL_OPERATION_CODE:
+                    raise
+                result = reassign(None)
+            request_cache.invalidate_collection(counselor_collection)
             return result
         except Exception as e:
             logger.error(f"Error reassigning lead: {str(e)}")
             return None
     
-    def search_leads(self, collection: str, counselor_id: str, filters: Dict[str, Any], page: int = 1, limit: int = 10) -> Dict[str, Any]:
+    def search_leads(self, collection: str, counselor_id: str, filters: Dict[str, Any], page: int = 1, limit: int = 10,
+                     projection: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Search leads with filters"""
         try:
             query = {"assigned_counselor_id": counselor_id}
             
             # Apply filters
-            if filters.get("status"):
-                query["status"] = filters["status"]
-            if filters.get("quality"):
-                query["quality"] = filters["quality"]
-            if filters.get("priority"):
-                query["priority"] = filters["priority"]
-            if filters.get("country"):
-                query["preferred_countries"] = {"$in": [filters["country"]]}
-            if filters.get("course"):
-                query["preferred_courses"] = {"$in": [filters["course"]]}
+            query.update(
+                LEAD_SEARCH_FILTERS[name](value)
+                for name, value in filters.items()
+                if value and name in LEAD_SEARCH_FILTERS
+            )
+            created_at = {}
             if filters.get("date_from"):
-                query["created_at"] = {"$gte": datetime.fromisoformat(filters["date_from"])}
+                created_at["$gte"] = datetime.fromisoformat(filters["date_from"])
             if filters.get("date_to"):
-                if "created_at" in query:
-                    query["created_at"]["$lte"] = datetime.fromisoformat(filters["date_to"])
-                else:
-                    query["created_at"] = {"$lte": datetime.fromisoformat(filters["date_to"])}
-            
-            # Get total count
-            total = self.database[collection].count_documents(query)
+                created_at["$lte"] = datetime.fromisoformat(filters["date_to"])
+            if created_at:
+                query["created_at"] = created_at
             
-            # Get paginated results
+            # Get the page and the total count in one round trip
             skip = (page - 1) * limit
-            leads = self.database[collection].find(query).sort("created_at", -1).skip(skip).limit(limit)
+            pipeline = [
+                {"$match": query},
+                {"$sort": {"created_at": -1}},
+                {"$facet": {
+                    "leads": [{"$skip": skip}, {"$limit": limit}] + ([{"$project": projection}] if projection else []),
+                    "total": [{"$count": "n"}]
+                }}
+            ]
+            result = run_with_index_hint(
+                lambda hint: next(self.database[collection].aggregate(pipeline, **({"hint": hint} if hint else {})), {}),
+                lead_index_hint(query)
+            )
+            leads = result.get("leads", [])
+            total = result["total"][0]["n"] if result.get("total") else 0
             
             return {
-                "leads": list(leads),
+                "leads": leads,
                 "total": total,
                 "page": page,
                 "limit": limit,
@@ -246,17 +429,28 @@ class LeadRepository(BaseRepository):
             logger.error(f"Error searching leads: {str(e)}")
             return {"leads": [], "total": 0, "page": page, "limit": limit, "pages": 0}
     
-    def add_note_to_lead(self, collection: str, lead_id: str, note: str, counselor_id: str) -> bool:
-        """Add note to lead"""
+    def add_note_to_lead(self, collection: str, lead_id: str, note: str, counselor_id: str,
+                         archive_collection: str = "lead_notes") -> bool:
+        """Add note to lead, keeping only the latest notes inline and every note in the archive"""
         try:
+            now = datetime.utcnow()
+            entry = {"ts": now, "by": counselor_id, "text": note}
             result = self.database[collection].update_one(
                 {"_id": lead_id, "assigned_counselor_id": counselor_id},
                 {
-                    "$push": {"notes": f"[{datetime.utcnow().strftime('%Y-%m-%d %H:%M')}] {note}"},
-                    "$set": {"updated_at": datetime.utcnow()}
+                    "$push": {"notes": {"$each": [entry], "$slice": -LEAD_RECENT_NOTES_LIMIT}},
+                    "$set": {"updated_at": now}
                 }
             )
-            return result.modified_count > 0
+            if result.modified_count == 0:
+                return False
+            self.database[archive_collection].insert_one({
+                "lead_id": lead_id,
+                "counselor_id": counselor_id,
+                "note": note,
+                "created_at": now
+            })
+            return True
         except Exception as e:
             logger.error(f"Error adding note to lead: {str(e)}")
             return False
@@ -281,32 +475,25 @@ class LeadRepository(BaseRepository):
     def get_dashboard_stats(self, collection: str, counselor_id: str) -> Dict[str, Any]:
         """Get dashboard statistics for counselor"""
         try:
-            pipeline = [
-                {"$match": {"assigned_counselor_id": counselor_id}},
-                {"$group": {
-                    "_id": "$status",
-                    "count": {"$sum": 1}
-                }}
-            ]
-            
-            stats = list(self.database[collection].aggregate(pipeline))
-            
-            # Convert to dictionary
-            status_counts = {stat["_id"]: stat["count"] for stat in stats}
-            
-            # Get follow-ups due today
-            today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+            now = datetime.utcnow()
+            today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
             today_end = today_start + timedelta(days=1)
             
-            follow_ups_today = self.database[collection].count_documents({
+            counters = self.database[LEAD_STATUS_COUNTERS_COLLECTION].find_one({"_id": counselor_id}, {"status_counts": 1})
+            status_counts = {
+                status: count for status, count in (counters or {}).get("status_counts", {}).items() if count > 0
+            }
+            
+            # Follow-up counts depend on the current time, so they are always queried;
+            # each is a range scan on the (assigned_counselor_id, next_follow_up) index
+            leads = self.database[collection]
+            follow_ups_today = leads.count_documents({
                 "assigned_counselor_id": counselor_id,
                 "next_follow_up": {"$gte": today_start, "$lt": today_end}
             })
-            
-            # Get overdue follow-ups
-            overdue_follow_ups = self.database[collection].count_documents({
+            overdue_follow_ups = leads.count_documents({
                 "assigned_counselor_id": counselor_id,
-                "next_follow_up": {"$lt": datetime.utcnow()}
+                "next_follow_up": {"$lt": now}
             })
             
             return {
@@ -326,42 +513,57 @@ class CallLogRepository(BaseRepository):
     def __init__(self, mongo_client: MongoClient):
         super().__init__(mongo_client)
     
-    def create_call_log(self, collection: str, call_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Create call log entry"""
-        try:
-            result = self.create(call_data, collection)
-            return result
-        except Exception as e:
-            logger.error(f"Error creating call log: {str(e)}")
-            return None
+    def _history(self, collection: str):
+        """Call history tolerates slight replica lag, so reads may be served by secondaries"""
+        return self.database[collection].with_options(read_preference=ReadPreference.SECONDARY_PREFERRED)
     
-    def get_call_logs_by_lead(self, collection: str, lead_id: str) -> List[Dict[str, Any]]:
-        """Get call logs for a lead"""
+    def create_call_log(self, collection: str, call_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create call log entry; inserted synchronously because the API echoes it back, errors propagate"""
+        call_data.setdefault("_id", str(ObjectId()))
+        self.database[collection].insert_one(call_data)
+        return call_data
+    
+    def get_call_logs_by_lead(self, collection: str, lead_id: str,
+                              projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Get call logs for a lead; read from the primary so a call just logged is included"""
         try:
-            logs = self.database[collection].find({"lead_id": lead_id}).sort("call_date", -1)
+            logs = self.database[collection].find({"lead_id": lead_id}, projection).sort("call_date", -1)
             return list(logs)
         except Exception as e:
             logger.error(f"Error getting call logs: {str(e)}")
             return []
     
-    def get_call_logs_by_counselor(self, collection: str, counselor_id: str, start_date: datetime = None, end_date: datetime = None) -> List[Dict[str, Any]]:
+    def get_call_logs_by_counselor(self, collection: str, counselor_id: str, start_date: datetime = None, end_date: datetime = None,
+                                   projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Get call logs for a counselor within date range"""
         try:
-            query = {"counselor_id": counselor_id}
-            
-            if start_date or end_date:
-                date_filter = {}
-                if start_date:
-                    date_filter["$gte"] = start_date
-                if end_date:
-                    date_filter["$lte"] = end_date
-                query["call_date"] = date_filter
-            
-            logs = self.database[collection].find(query).sort("call_date", -1)
-            return list(logs)
+            return list(self.iter_call_logs_by_counselor(collection, counselor_id, start_date, end_date, projection))
         except Exception as e:
             logger.error(f"Error getting counselor call logs: {str(e)}")
             return []
+    
+    def iter_call_logs_by_counselor(self, collection: str, counselor_id: str, start_date: datetime = None, end_date: datetime = None,
+                                    projection: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """Stream call logs for a counselor within date range, newest first, fetched CALL_LOG_BATCH_SIZE at a time"""
+        query = {"counselor_id": counselor_id}
+        
+        if start_date or end_date:
+            date_filter = {}
+            if start_date:
+                date_filter["$gte"] = start_date
+            if end_date:
+                date_filter["$lte"] = end_date
+            query["call_date"] = date_filter
+        
+        return self._history(collection).find(query, projection).sort("call_date", -1).batch_size(CALL_LOG_BATCH_SIZE)
+    
+    def count_call_logs_by_lead(self, collection: str, lead_id: str) -> int:
+        """Count calls logged for a lead"""
+        try:
+            return self.database[collection].count_documents({"lead_id": lead_id})
+        except Exception as e:
+            logger.error(f"Error counting call logs: {str(e)}")
+            return 0
 
 
 class MessageLogRepository(BaseRepository):
@@ -370,14 +572,23 @@ class MessageLogRepository(BaseRepository):
     def __init__(self, mongo_client: MongoClient):
         super().__init__(mongo_client)
     
-    def create_message_log(self, collection: str, message_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Create message log entry"""
+    def create_message_log(self, collection: str, message_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Create message log entry; inserted synchronously because the API echoes it back, errors propagate"""
+        message_data.setdefault("_id", str(ObjectId()))
+        self.database[collection].insert_one(message_data)
+        return message_data
+    
+    def count_message_logs_by_type(self, collection: str, lead_id: str) -> Dict[str, int]:
+        """Count messages sent to a lead, grouped by message type"""
         try:
-            result = self.create(message_data, collection)
-            return result
+            pipeline = [
+                {"$match": {"lead_id": lead_id}},
+                {"$group": {"_id": "$message_type", "count": {"$sum": 1}}}
+            ]
+            return {doc["_id"]: doc["count"] for doc in self.database[collection].aggregate(pipeline)}
         except Exception as e:
-            logger.error(f"Error creating message log: {str(e)}")
-            return None
+            logger.error(f"Error counting message logs: {str(e)}")
+            return {}
     
     def get_message_logs_by_lead(self, collection: str, lead_id: str) -> List[Dict[str, Any]]:
         """Get message logs for a lead"""
@@ -408,22 +619,29 @@ class NotificationRepository(BaseRepository):
         super().__init__(mongo_client)
     
     def create_notification(self, collection: str, notification_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Create notification"""
+        """
+        Queue a notification insert; the returned document is not yet persisted.
+
+        Delivery is best-effort: a failed bulk write is only logged by the batch
+        writer, and anything still queued is lost if the process crashes.
+        """
         try:
-            result = self.create(notification_data, collection)
-            return result
+            notification_data.setdefault("_id", str(ObjectId()))
+            self.queue_write(collection, InsertOne(notification_data))
+            return notification_data
         except Exception as e:
             logger.error(f"Error creating notification: {str(e)}")
             return None
     
-    def get_notifications_by_counselor(self, collection: str, counselor_id: str, unread_only: bool = False) -> List[Dict[str, Any]]:
+    def get_notifications_by_counselor(self, collection: str, counselor_id: str, unread_only: bool = False,
+                                       projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Get notifications for counselor"""
         try:
             query = {"counselor_id": counselor_id}
             if unread_only:
                 query["read"] = False
             
-            notifications = self.database[collection].find(query).sort("created_at", -1).limit(50)
+            notifications = self.database[collection].find(query, projection).sort("created_at", -1).limit(50)
             return list(notifications)
         except Exception as e:
             logger.error(f"Error getting notifications: {str(e)}")
@@ -1,5 +1,6 @@
 from typing import List, Optional, Dict, Any
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError
 import pymongo
 from app.repository.base import BaseRepository
 from app.model.role import RoleDB, PermissionDB, UserRoleDB
@@ -23,7 +24,7 @@ class RoleRepository(BaseRepository):
         created_model = self.database[collection].find_one(
             {"_id": new_model.inserted_id}
         )
-        return RoleDB(**created_model)
+        return RoleDB.from_mongo(created_model)
 
     def get_by_id(self, collection: str, id: str) -> Optional[RoleDB]:
         """Get a document by ID"""
@@ -31,13 +32,13 @@ class RoleRepository(BaseRepository):
             # First try to find by string ID (current database format)
             find_model = self.database[collection].find_one({"_id": id})
             if find_model:
-                return RoleDB(**find_model)
+                return RoleDB.from_mongo(find_model)
             
             # If not found, try ObjectId format (for compatibility)
             if ObjectId.is_valid(id):
                 find_model = self.database[collection].find_one({"_id": ObjectId(id)})
                 if find_model:
-                    return RoleDB(**find_model)
+                    return RoleDB.from_mongo(find_model)
             
             return None
         except Exception as e:
@@ -49,8 +50,8 @@ class RoleRepository(BaseRepository):
                  sort_order: int = pymongo.DESCENDING, skip: int = 0, limit: int = 1000):
         """Get a list of documents"""
         docs = self.database[collection].find({}).sort([(sort_field, sort_order)]).skip(skip).limit(limit)
-        total = self.database[collection].count_documents(filter={})
-        return [RoleDB(**doc) for doc in docs], total
+        total = self.database[collection].estimated_document_count()
+        return [RoleDB.from_mongo(doc) for doc in docs], total
 
     def create_role(self, collection: str, role: RoleDB) -> RoleDB:
         """Create a new role"""
@@ -60,9 +61,28 @@ class RoleRepository(BaseRepository):
         """Get a role by name"""
         role_data = self.database[collection].find_one({"name": name})
         if role_data:
-            return RoleDB(**role_data)
+            return RoleDB.from_mongo(role_data)
         return None
 
+    def bulk_upsert_roles(self, collection: str, roles: List[RoleDB]) -> Dict[str, Any]:
+        """
+        Insert the roles that don't exist yet (matched by name) in a single bulk write.
+
+        Returns a dict with the name -> ID mapping of all given roles and the
+        names of the roles that were newly created.
+        """
+        names = [role.name for role in roles]
+        operations = [
+            UpdateOne({"name": role.name}, {"$setOnInsert": jsonable_encoder(role)}, upsert=True)
+            for role in roles
+        ]
+        result = self.database[collection].bulk_write(operations, ordered=False)
+        roles_data = self.database[collection].find({"name": {"$in": names}}, {"name": 1})
+        return {
+            "role_ids": {role_data["name"]: str(role_data["_id"]) for role_data in roles_data},
+            "created": [names[index] for index in result.upserted_ids]
+        }
+
     def get_role_by_id(self, collection: str, role_id: str) -> Optional[RoleDB]:
         """Get a role by ID"""
         return self.get_by_id(collection, role_id)
@@ -77,7 +97,7 @@ class RoleRepository(BaseRepository):
                 return_document=True
             )
             if result:
-                return RoleDB(**result)
+                return RoleDB.from_mongo(result)
         return None
 
     def delete_role(self, collection: str, role_id: str) -> bool:
@@ -88,12 +108,17 @@ class RoleRepository(BaseRepository):
     def get_roles_for_user(self, user_roles_collection: str, roles_collection: str, user_id: str) -> List[RoleDB]:
         """Get all roles assigned to a user"""
         # First get user role assignments
-        user_role_assignments = self.database[user_roles_collection].find({"user_id": user_id})
-        role_ids = [ObjectId(assignment["role_id"]) for assignment in user_role_assignments]
+        user_role_assignments = self.database[user_roles_collection].find({"user_id": user_id}, {"role_id": 1})
+        role_ids = []
+        for assignment in user_role_assignments:
+            # Roles are stored with string IDs; keep ObjectId form for compatibility
+            role_ids.append(assignment["role_id"])
+            if ObjectId.is_valid(assignment["role_id"]):
+                role_ids.append(ObjectId(assignment["role_id"]))
         
         # Then get the actual role documents
         roles_data = self.database[roles_collection].find({"_id": {"$in": role_ids}})
-        return [RoleDB(**role_data) for role_data in roles_data]
+        return [RoleDB.from_mongo(role_data) for role_data in roles_data]
 
     def add_permission_to_role(self, collection: str, role_id: str, permission_id: str) -> bool:
         """Add a permission to a role"""
@@ -126,7 +151,7 @@ class PermissionRepository(BaseRepository):
         created_model = self.database[collection].find_one(
             {"_id": new_model.inserted_id}
         )
-        return PermissionDB(**created_model)
+        return PermissionDB.from_mongo(created_model)
 
     def get_by_id(self, collection: str, id: str) -> Optional[PermissionDB]:
         """Get a document by ID"""
@@ -134,13 +159,13 @@ class PermissionRepository(BaseRepository):
             # First try to find by string ID (current database format)
             find_model = self.database[collection].find_one({"_id": id})
             if find_model:
-                return PermissionDB(**find_model)
+                return PermissionDB.from_mongo(find_model)
             
             # If not found, try ObjectId format (for compatibility)
             if ObjectId.is_valid(id):
                 find_model = self.database[collection].find_one({"_id": ObjectId(id)})
                 if find_model:
-                    return PermissionDB(**find_model)
+                    return PermissionDB.from_mongo(find_model)
             
             return None
         except Exception as e:
@@ -152,8 +177,8 @@ class PermissionRepository(BaseRepository):
                  sort_order: int = pymongo.DESCENDING, skip: int = 0, limit: int = 1000):
         """Get a list of documents"""
         docs = self.database[collection].find({}).sort([(sort_field, sort_order)]).skip(skip).limit(limit)
-        total = self.database[collection].count_documents(filter={})
-        return [PermissionDB(**doc) for doc in docs], total
+        total = self.database[collection].estimated_document_count()
+        return [PermissionDB.from_mongo(doc) for doc in docs], total
 
     def create_permission(self, collection: str, permission: PermissionDB) -> PermissionDB:
         """Create a new permission"""
@@ -163,9 +188,40 @@ class PermissionRepository(BaseRepository):
         """Get a permission by name"""
         permission_data = self.database[collection].find_one({"name": name})
         if permission_data:
-            return PermissionDB(**permission_data)
+            return PermissionDB.from_mongo(permission_data)
         return None
 
+    def get_permission_ids_by_names(self, collection: str, names: List[str]) -> Dict[str, str]:
+        """Get a name -> ID mapping for the permissions that exist among the given names"""
+        permissions_data = self.database[collection].find({"name": {"$in": names}}, {"name": 1})
+        return {perm_data["name"]: str(perm_data["_id"]) for perm_data in permissions_data}
+
+    def bulk_create_permissions(self, collection: str, permissions: List[PermissionDB]) -> List[str]:
+        """
+        Insert several permissions in one round trip and return their IDs in input order.
+
+        The insert is unordered, so permissions seeded concurrently by another worker only
+        fail their own document with a duplicate key error; those are resolved to the
+        existing IDs by name while any other write error is re-raised.
+        """
+        if not permissions:
+            return []
+        documents = [jsonable_encoder(permission) for permission in permissions]
+        try:
+            self.database[collection].insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            write_errors = e.details.get("writeErrors", [])
+            if e.details.get("writeConcernErrors") or any(error.get("code") != 11000 for error in write_errors):
+                raise
+            duplicates = {documents[error["index"]]["name"] for error in write_errors}
+            existing_ids = self.get_permission_ids_by_names(collection, list(duplicates))
+            return [
+                existing_ids.get(document["name"], document["_id"]) if document["name"] in duplicates
+                else str(document["_id"])
+                for document in documents
+            ]
+        return [str(document["_id"]) for document in documents]
+
     def get_permission_by_id(self, collection: str, permission_id: str) -> Optional[PermissionDB]:
         """Get a permission by ID"""
         return self.get_by_id(collection, permission_id)
@@ -175,7 +231,7 @@ class PermissionRepository(BaseRepository):
         try:
             # First try to find by string IDs (current database format)
             permissions_data = self.database[collection].find({"_id": {"$in": permission_ids}})
-            results = [PermissionDB(**perm_data) for perm_data in permissions_data]
+            results = [PermissionDB.from_mongo(perm_data) for perm_data in permissions_data]
             
             # If we didn't find all permissions, try ObjectId format for the missing ones
             if len(results) < len(permission_ids):
@@ -190,7 +246,7 @@ class PermissionRepository(BaseRepository):
                 
                 if object_ids:
                     additional_data = self.database[collection].find({"_id": {"$in": object_ids}})
-                    results.extend([PermissionDB(**perm_data) for perm_data in additional_data])
+                    results.extend([PermissionDB.from_mongo(perm_data) for perm_data in additional_data])
             
             return results
         except Exception as e:
@@ -207,7 +263,7 @@ class PermissionRepository(BaseRepository):
                 return_document=True
             )
             if result:
-                return PermissionDB(**result)
+                return PermissionDB.from_mongo(result)
         return None
 
     def delete_permission(self, collection: str, permission_id: str) -> bool:
@@ -221,18 +277,52 @@ class PermissionRepository(BaseRepository):
         role_repo = RoleRepository(self.mongo_client)
         user_roles = role_repo.get_roles_for_user(user_roles_collection, roles_collection, user_id)
         
-        # Collect all permission IDs from user's roles
-        permission_ids = []
+        # Collect the unique permission IDs from user's roles
+        permission_ids = set()
         for role in user_roles:
-            permission_ids.extend(role.permissions)
+            permission_ids.update(role.permissions)
         
-        # Remove duplicates and get permission documents
-        unique_permission_ids = list(set(permission_ids))
-        if unique_permission_ids:
-            return self.get_permissions_by_ids(permissions_collection, unique_permission_ids)
+        if permission_ids:
+            return self.get_permissions_by_ids(permissions_collection, list(permission_ids))
         return []
 
 
+    def get_admin_and_permissions(self, user_roles_collection: str, roles_collection: str, permissions_collection: str, user_id: str) -> Dict[str, Any]:
+        """Get a user's role names, admin flag and permission names in a single aggregation"""
+        pipeline = [
+            {"$match": {"user_id": user_id}},
+            {"$lookup": {
+                "from": roles_collection,
+                "localField": "role_id",
+                "foreignField": "_id",
+                "as": "role"
+            }},
+            {"$unwind": "$role"},
+            {"$lookup": {
+                "from": permissions_collection,
+                "localField": "role.permissions",
+                "foreignField": "_id",
+                "as": "permissions"
+            }},
+            {"$unwind": {"path": "$permissions", "preserveNullAndEmptyArrays": True}},
+            {"$group": {
+                "_id": None,
+                "roles": {"$addToSet": "$role.name"},
+                "permissions": {"$addToSet": "$permissions.name"}
+            }}
+        ]
+        result = next(self.database[user_roles_collection].aggregate(pipeline), None)
+        if not result:
+            return {"is_admin": False, "roles": set(), "permissions": set()}
+
+        roles = set(result["roles"])
+        return {
+            "is_admin": "admin" in roles,
+            "roles": roles,
+            "permissions": {name for name in result["permissions"] if name is not None}
+        }
+
+
 class UserRoleRepository(BaseRepository):
     """Repository for user-role assignment operations"""
 
@@ -247,7 +337,7 @@ class UserRoleRepository(BaseRepository):
         created_model = self.database[collection].find_one(
             {"_id": new_model.inserted_id}
         )
-        return UserRoleDB(**created_model)
+        return UserRoleDB.from_mongo(created_model)
 
     def assign_role_to_user(self, collection: str, user_role: UserRoleDB) -> UserRoleDB:
         """Assign a role to a user"""
@@ -268,18 +358,18 @@ class UserRoleRepository(BaseRepository):
             "role_id": role_id
         })
         if assignment_data:
-            return UserRoleDB(**assignment_data)
+            return UserRoleDB.from_mongo(assignment_data)
         return None
 
     def get_user_role_assignments(self, collection: str, user_id: str) -> List[UserRoleDB]:
         """Get all role assignments for a user"""
         assignments_data = self.database[collection].find({"user_id": user_id})
-        return [UserRoleDB(**assignment_data) for assignment_data in assignments_data]
+        return [UserRoleDB.from_mongo(assignment_data) for assignment_data in assignments_data]
 
     def get_role_assignments(self, collection: str, role_id: str) -> List[UserRoleDB]:
         """Get all user assignments for a role"""
         assignments_data = self.database[collection].find({"role_id": role_id})
-        return [UserRoleDB(**assignment_data) for assignment_data in assignments_data]
+        return [UserRoleDB.from_mongo(assignment_data) for assignment_data in assignments_data]
 
     def user_has_role(self, collection: str, user_id: str, role_name: str, roles_collection: str) -> bool:
         """Check if a user has a specific role"""
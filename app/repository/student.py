@@ -1,5 +1,6 @@
+import asyncio
 from pymongo import MongoClient
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from app.repository.base import BaseRepository
 from app.core.config import MONGO_COLLECTION_STUDENT_PROFILES
 import logging
@@ -7,6 +8,51 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+class ProfileBatchLoader:
+    """
+    Coalesces profile lookups issued within the same event-loop tick into a
+    single `{"user_id": {"$in": [...]}}` query (DataLoader-style batching).
+    """
+
+    def __init__(self):
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._repo: Optional["StudentRepository"] = None
+
+    async def load(self, repo: "StudentRepository", user_id: str) -> Optional[Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if not self._pending:
+            # First key of this tick schedules the batch
+            self._repo = repo
+            loop.call_soon(self._dispatch)
+        self._pending.setdefault(user_id, []).append(future)
+        return await future
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        repo, self._repo = self._repo, None
+        # The query itself runs on the default executor so it doesn't block the loop
+        batch = asyncio.get_running_loop().run_in_executor(None, repo.get_profiles_by_user_ids, list(pending))
+        batch.add_done_callback(lambda done: self._resolve(pending, done))
+
+    @staticmethod
+    def _resolve(pending: Dict[str, List[asyncio.Future]], batch: asyncio.Future) -> None:
+        error = batch.exception()
+        profiles = batch.result() if error is None else None
+        for user_id, futures in pending.items():
+            for future in futures:
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(profiles.get(user_id))
+
+
+# Shared across requests so concurrent lookups can be batched together
+profile_loader = ProfileBatchLoader()
+
+
 class StudentRepository(BaseRepository):
     """Repository for student profile operations"""
     
@@ -14,14 +60,30 @@ class StudentRepository(BaseRepository):
         super().__init__(mongo_client)
         self.collection_name = MONGO_COLLECTION_STUDENT_PROFILES
     
-    def get_profile_by_user_id(self, user_id: str) -> Optional[Dict[str, Any]]:
-        """Get student profile by user ID"""
+    def get_profile_by_user_id(self, user_id: str, projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Get student profile by user ID, optionally limited to the projected fields"""
         try:
-            return self.get_by_field(self.collection_name, "user_id", user_id)
+            return self.database[self.collection_name].find_one({"user_id": user_id}, projection)
         except Exception as e:
             logger.error(f"Error getting student profile: {str(e)}")
             return None
     
+    def get_profiles_by_user_ids(self, user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get student profiles for several users in one query, keyed by user ID"""
+        profiles = {}
+        for profile in self.database[self.collection_name].find({"user_id": {"$in": user_ids}}):
+            profile["_id"] = str(profile["_id"])
+            profiles[profile["user_id"]] = profile
+        return profiles
+
+    async def load_profile_by_user_id(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get student profile by user ID, batched with concurrent lookups"""
+        try:
+            return await profile_loader.load(self, user_id)
+        except Exception as e:
+            logger.error(f"Error loading student profile: {str(e)}")
+            return None
+    
     def create_profile(self, user_id: str, profile_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Create new student profile"""
         try:
@@ -1,13 +1,17 @@
 from pymongo import MongoClient
 import pymongo
 from app.core.config import MONGO_COLLECTION_USERS
-from app.repository.base import BaseRepository
+from app.repository.base import BaseRepository, projection_for
 from app.model.user import UserDB
 from pydantic import conint
 from app.schema.user import User
 from fastapi.encoders import jsonable_encoder
 
 
+# Every stored user field, kept when the joined profile is projected down
+USER_PROJECTION = projection_for(UserDB)
+
+
 class UserRepository(BaseRepository):
     """
     Repository class for interacting with the users collection in MongoDB.
@@ -33,21 +37,48 @@ class UserRepository(BaseRepository):
             {"_id": new_model.inserted_id}
 
         )
-        return UserDB(**created_model)
+        return UserDB.from_mongo(created_model)
     
     def get_by_id(self, collection: MONGO_COLLECTION_USERS, id: str) -> User :
         find_model = self.database[collection].find_one(
             {"_id": id}
         )
 
-        return UserDB(**find_model)
+        return UserDB.from_mongo(find_model)
 
     def get_by_name(self, collection: MONGO_COLLECTION_USERS, name: str):
         find_model = self.database[collection].find_one(
             {"username": name}
         )
 
-        return UserDB(**find_model) if find_model else None
+        return UserDB.from_mongo(find_model) if find_model else None
+
+    def get_by_name_with_profile(self, collection: MONGO_COLLECTION_USERS, profiles_collection: str, name: str,
+                                 profile_projection: dict = None):
+        """Fetch a user and their student profile (if any) in one aggregation."""
+        pipeline = [
+            {"$match": {"username": name}},
+            {"$limit": 1},
+            {"$lookup": {
+                "from": profiles_collection,
+                "localField": "_id",
+                "foreignField": "user_id",
+                "as": "profile"
+            }},
+            {"$unwind": {"path": "$profile", "preserveNullAndEmptyArrays": True}}
+        ]
+        if profile_projection:
+            # Trimmed by an outer $project: a $lookup "pipeline" alongside localField/foreignField
+            # needs MongoDB 5.0+. profile._id is kept so an existing profile never projects to {}
+            projection = dict(USER_PROJECTION, **{"profile._id": 1})
+            projection.update({f"profile.{field}": value for field, value in profile_projection.items()})
+            pipeline.append({"$project": projection})
+        found = next(self.database[collection].aggregate(pipeline), None)
+        if not found:
+            return None, None
+
+        profile = found.pop("profile", None)
+        return UserDB.from_mongo(found), profile
 
     def get_list(self,
                  collection: MONGO_COLLECTION_USERS,
@@ -58,9 +89,9 @@ class UserRepository(BaseRepository):
                  ):
 
         users= self.database[collection].find({}).sort([(sort_field, sort_order)]).skip(skip).limit(limit)
-        total = self.database[collection].count_documents(filter={})
+        total = self.database[collection].estimated_document_count()
 
-        return [UserDB(**user) for user in users], total
+        return [UserDB.from_mongo(user) for user in users], total
 
     def delete(self, collection: MONGO_COLLECTION_USERS, id: str) -> User:
         find_model = self.database[collection].find_one(
@@ -70,7 +101,7 @@ class UserRepository(BaseRepository):
             {"_id": id}
         )
 
-        return UserDB(**find_model)
+        return UserDB.from_mongo(find_model)
 
     def update(self,
                collection: MONGO_COLLECTION_USERS,
@@ -93,8 +124,9 @@ class UserRepository(BaseRepository):
 
         else:
             remove_pairs_with_none_in_place(request_in_json)
-            update_model = self.database[collection].update_one(filter={'_id': id}, update={"$set": request_in_json})
-            updated_model = self.database[collection].find_one({"_id": id})
-            return UserDB(**updated_model)
+            updated_model = self.database[collection].find_one_and_update(
+                {'_id': id}, {"$set": request_in_json}, return_document=pymongo.ReturnDocument.AFTER
+            )
+            return UserDB.from_mongo(updated_model)
 
 
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_validator, validator
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from enum import Enum
@@ -146,6 +146,12 @@ class LeadNote(BaseModel):
     note: str = Field(..., min_length=1, max_length=1000)
 
 
+class LeadNoteResponse(BaseModel):
+    ts: Optional[datetime] = None
+    by: Optional[str] = None
+    text: str
+
+
 class FollowUpSchedule(BaseModel):
     follow_up_date: datetime
 
@@ -166,10 +172,16 @@ class LeadResponse(BaseModel):
     assigned_at: datetime
     last_contact_date: Optional[datetime] = None
     next_follow_up: Optional[datetime] = None
-    notes: List[str]
+    notes: List[LeadNoteResponse]
     created_at: datetime
     updated_at: datetime
 
+    @field_validator("notes", mode="before")
+    @classmethod
+    def _legacy_string_notes(cls, notes):
+        # Notes written before they became subdocuments were "[timestamp] text" strings
+        return [{"text": note} if isinstance(note, str) else note for note in notes or []]
+
     class Config:
         populate_by_name = True
 
@@ -61,10 +61,10 @@ class S3UploadService:
             elif file_type == "document":
                 allowed_extensions = self.allowed_document_ext
             else:
-                allowed_extensions = self.allowed_image_ext + self.allowed_document_ext
+                allowed_extensions = self.allowed_image_ext | self.allowed_document_ext
             
             if file_extension not in allowed_extensions:
-                return False, f"File extension '{file_extension}' not allowed. Allowed: {', '.join(allowed_extensions)}"
+                return False, f"File extension '{file_extension}' not allowed. Allowed: {', '.join(sorted(allowed_extensions))}"
             
             return True, "File is valid"
             
@@ -246,8 +246,8 @@ class S3UploadService:
             "s3_enabled": self.s3_enabled,
             "max_file_size": self.max_file_size,
             "max_file_size_mb": self.max_file_size / (1024 * 1024),
-            "allowed_image_extensions": self.allowed_image_ext,
-            "allowed_document_extensions": self.allowed_document_ext,
+            "allowed_image_extensions": sorted(self.allowed_image_ext),
+            "allowed_document_extensions": sorted(self.allowed_document_ext),
             "bucket_name": self.bucket_name if self.s3_enabled else None
         }
 
@@ -0,0 +1,73 @@
+import threading
+from unittest.mock import MagicMock
+import pytest
+from pymongo import InsertOne
+from pymongo.errors import BulkWriteError
+from app.repository.batch import BatchProcessor
+
+# Long enough that the interval never fires during a test that doesn't want it to
+NEVER_MS = 60_000
+
+
+@pytest.fixture
+def database():
+    database = MagicMock()
+    database.flushed = threading.Event()
+    database.__getitem__.return_value.bulk_write.side_effect = lambda ops, ordered: database.flushed.set()
+    return database
+
+
+def bulk_writes(database):
+    return [(call.args[0], call.kwargs) for call in database.__getitem__.return_value.bulk_write.call_args_list]
+
+
+def test_flushes_once_max_ops_are_queued(database):
+    writer = BatchProcessor(database, max_ops=3, flush_interval_ms=NEVER_MS)
+    ops = [InsertOne({"n": n}) for n in range(3)]
+    try:
+        for op in ops:
+            writer.submit("notifications", op)
+        assert database.flushed.wait(5)
+    finally:
+        writer.close()
+
+    assert bulk_writes(database) == [(ops, {"ordered": False})]
+    database.__getitem__.assert_called_with("notifications")
+
+
+def test_flushes_on_the_interval(database):
+    writer = BatchProcessor(database, max_ops=500, flush_interval_ms=10)
+    op = InsertOne({"n": 1})
+    try:
+        writer.submit("notifications", op)
+        assert database.flushed.wait(5)
+    finally:
+        writer.close()
+
+    assert bulk_writes(database) == [([op], {"ordered": False})]
+
+
+def test_close_flushes_what_is_still_queued(database):
+    writer = BatchProcessor(database, max_ops=500, flush_interval_ms=NEVER_MS)
+    ops = [InsertOne({"n": 1}), InsertOne({"n": 2})]
+    for op in ops:
+        writer.submit("notifications", op)
+    assert bulk_writes(database) == []
+
+    writer.close()
+
+    assert bulk_writes(database) == [(ops, {"ordered": False})]
+    assert not writer._thread.is_alive()
+
+
+def test_failed_bulk_write_does_not_stop_later_flushes(database):
+    database.__getitem__.return_value.bulk_write.side_effect = [
+        BulkWriteError({"writeErrors": [{"index": 0}]}), None
+    ]
+    writer = BatchProcessor(database, max_ops=500, flush_interval_ms=NEVER_MS)
+    writer.submit("notifications", InsertOne({"n": 1}))
+    writer.flush()
+    writer.submit("notifications", InsertOne({"n": 2}))
+    writer.close()
+
+    assert [len(ops) for ops, _ in bulk_writes(database)] == [1, 1]
@@ -0,0 +1,143 @@
+import pytest
+from unittest.mock import MagicMock
+from pymongo.errors import OperationFailure
+from app.core.config import MONGO_DATABASE
+from app.repository.counselor import LeadRepository
+
+
+MISSING_HINT_MESSAGE = "error processing query :: caused by :: hint provided does not correspond to an existing index"
+MISSING_HINT_ERROR = OperationFailure(
+    MISSING_HINT_MESSAGE, code=2, details={"ok": 0, "errmsg": MISSING_HINT_MESSAGE, "code": 2, "codeName": "BadValue"}
+)
+
+
+@pytest.fixture
+def leads_collection():
+    client = MagicMock()
+    collection = client[MONGO_DATABASE]["leads"]
+    return LeadRepository(client), collection
+
+
+def test_search_leads_hints_index_as_document(leads_collection):
+    repo, collection = leads_collection
+    collection.aggregate.return_value = iter([{"leads": [{"_id": "1"}], "total": [{"n": 1}]}])
+
+    result = repo.search_leads("leads", "c1", {"status": "new"})
+
+    assert result["leads"] == [{"_id": "1"}]
+    assert result["total"] == 1
+    hint = collection.aggregate.call_args.kwargs["hint"]
+    assert hint == {"assigned_counselor_id": 1, "status": 1, "created_at": -1}
+    assert isinstance(hint, dict)
+
+
+def test_search_leads_retries_without_missing_hint(leads_collection):
+    repo, collection = leads_collection
+    collection.aggregate.side_effect = [
+        MISSING_HINT_ERROR,
+        iter([{"leads": [{"_id": "1"}, {"_id": "2"}], "total": [{"n": 2}]}]),
+    ]
+
+    result = repo.search_leads("leads", "c1", {})
+
+    assert result["total"] == 2
+    assert "hint" not in collection.aggregate.call_args.kwargs
+
+
+def test_search_leads_does_not_retry_other_failures_mentioning_hint(leads_collection):
+    repo, collection = leads_collection
+    collection.aggregate.side_effect = OperationFailure(
+        "$hint is not allowed in this context", code=40324,
+        details={"ok": 0, "errmsg": "$hint is not allowed in this context", "code": 40324}
+    )
+
+    assert repo.search_leads("leads", "c1", {})["total"] == 0
+    assert collection.aggregate.call_count == 1
+
+
+def test_get_leads_by_counselor_retries_without_missing_hint(leads_collection):
+    repo, collection = leads_collection
+    hinted = MagicMock()
+    hinted.sort.side_effect = MISSING_HINT_ERROR
+    unhinted = MagicMock()
+    unhinted.sort.return_value = iter([{"_id": "1"}])
+    collection.find.return_value.hint.side_effect = lambda hint: hinted if hint else unhinted
+
+    assert repo.get_leads_by_counselor("leads", "c1", status="new") == [{"_id": "1"}]
+
+
+def test_reassign_lead_falls_back_without_transactions(leads_collection):
+    repo, collection = leads_collection
+    session = repo.mongo_client.start_session.return_value.__enter__.return_value
+    session.with_transaction.side_effect = OperationFailure(
+        "Transaction numbers are only allowed on a replica set member or mongos", code=20
+    )
+    collection.find_one_and_update.return_value = {"_id": "l1", "assigned_counselor_id": "c1", "status": "new"}
+
+    result = repo.reassign_lead("leads", "l1", "c2", "c1")
+
+    assert result["assigned_counselor_id"] == "c2"
+    counselors = repo.database["counselor_profiles"]
+    increments = [call.args for call in counselors.update_one.call_args_list]
+    assert ({"_id": "c1", "current_leads_count": {"$gt": 0}}, {"$inc": {"current_leads_count": -1}}) in increments
+    assert ({"_id": "c2"}, {"$inc": {"current_leads_count": 1}}) in increments
+
+
+def test_update_lead_status_upserts_counter_deltas(leads_collection):
+    repo, collection = leads_collection
+    collection.find_one_and_update.return_value = {"_id": "l1", "assigned_counselor_id": "c1", "status": "new"}
+
+    result = repo.update_lead_status("leads", "l1", "contacted", "c1")
+
+    assert result["status"] == "contacted"
+    args, kwargs = collection.update_one.call_args
+    assert args[0] == {"_id": "c1"}
+    assert args[1]["$inc"] == {"status_counts.new": -1, "status_counts.contacted": 1}
+    assert kwargs["upsert"] is True
+
+
+def test_counselor_profile_lookup_is_cached_within_a_request():
+    from app.core import request_cache
+    from app.repository.counselor import CounselorRepository
+
+    client = MagicMock()
+    profiles = client[MONGO_DATABASE]["counselor_profiles"]
+    profiles.find_one.return_value = {"_id": "c1", "user_id": "u1"}
+    repo = CounselorRepository(client)
+
+    token = request_cache.start_request_cache()
+    try:
+        assert repo.get_profile_by_user_id("counselor_profiles", "u1") == {"_id": "c1", "user_id": "u1"}
+        assert repo.get_profile_by_user_id("counselor_profiles", "u1")["_id"] == "c1"
+    finally:
+        request_cache.stop_request_cache(token)
+
+    profiles.find_one.assert_called_once_with({"user_id": "u1"})
+
+
+def test_create_call_log_inserts_before_returning():
+    from app.repository.counselor import CallLogRepository
+
+    client = MagicMock()
+    call_logs = client[MONGO_DATABASE]["call_logs"]
+    repo = CallLogRepository(client)
+
+    call_log = repo.create_call_log("call_logs", {"lead_id": "l1", "counselor_id": "c1"})
+
+    call_logs.insert_one.assert_called_once_with(call_log)
+    assert isinstance(call_log["_id"], str)
+
+
+def test_dashboard_follow_ups_are_counted_on_the_follow_up_index(leads_collection):
+    repo, collection = leads_collection
+    collection.find_one.return_value = {"_id": "c1", "status_counts": {"new": 2, "contacted": 0}}
+    collection.count_documents.side_effect = [1, 3]
+
+    stats = repo.get_dashboard_stats("leads", "c1")
+
+    assert stats == {"status_counts": {"new": 2}, "follow_ups_today": 1, "overdue_follow_ups": 3, "total_leads": 2}
+    collection.aggregate.assert_not_called()
+    for call in collection.count_documents.call_args_list:
+        query = call.args[0]
+        assert query["assigned_counselor_id"] == "c1"
+        assert "$lt" in query["next_follow_up"]
@@ -0,0 +1,26 @@
+from unittest.mock import MagicMock, patch
+import pytest
+from app.core import database
+
+
+def test_auth_seed_waits_for_unique_name_indexes():
+    client = MagicMock()
+    order = []
+    client.__getitem__.return_value.__getitem__.return_value.create_index.side_effect = \
+        lambda keys, **options: order.append(("index", keys, options))
+
+    with patch("app.core.init_auth.initialize_auth_system", lambda m: order.append("seed") or {"status": "ok"}):
+        assert database.seed_auth_system(client) == {"status": "ok"}
+
+    assert order == [("index", [("name", 1)], {"unique": True})] * 2 + ["seed"]
+
+
+def test_auth_seed_is_skipped_without_unique_name_indexes():
+    client = MagicMock()
+    client.__getitem__.return_value.__getitem__.return_value.create_index.side_effect = Exception("duplicate key")
+    seed = MagicMock()
+
+    with patch("app.core.init_auth.initialize_auth_system", seed), pytest.raises(RuntimeError):
+        database.seed_auth_system(client)
+
+    seed.assert_not_called()
@@ -0,0 +1,26 @@
+import warnings
+from datetime import datetime
+from fastapi.encoders import jsonable_encoder
+from app.model.role import UserRoleDB
+from app.model.user import UserDB
+
+
+def test_from_mongo_parses_json_encoded_datetimes():
+    user = UserDB(email="a@example.com", hashed_password="x", username="a")
+
+    loaded = UserDB.from_mongo(jsonable_encoder(user, by_alias=True))
+
+    assert isinstance(loaded.created_at, datetime)
+    assert loaded.created_at == user.created_at
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        loaded.model_dump_json()
+
+
+def test_from_mongo_keeps_missing_optional_datetimes():
+    assignment = UserRoleDB(user_id="u1", role_id="r1", granted_by="admin")
+
+    loaded = UserRoleDB.from_mongo(jsonable_encoder(assignment, by_alias=True))
+
+    assert isinstance(loaded.granted_at, datetime)
+    assert loaded.expires_at is None
@@ -0,0 +1,56 @@
+import asyncio
+from unittest.mock import MagicMock
+import pytest
+from app.repository.student import ProfileBatchLoader
+
+
+@pytest.fixture
+def repo():
+    repo = MagicMock()
+    repo.get_profiles_by_user_ids.side_effect = lambda user_ids: {
+        user_id: {"user_id": user_id} for user_id in user_ids if user_id != "missing"
+    }
+    return repo
+
+
+def test_loader_coalesces_concurrent_lookups_into_one_query(repo):
+    loader = ProfileBatchLoader()
+
+    async def run():
+        return await asyncio.gather(
+            loader.load(repo, "u1"), loader.load(repo, "u2"), loader.load(repo, "u1"), loader.load(repo, "missing")
+        )
+
+    results = asyncio.run(run())
+
+    assert results == [{"user_id": "u1"}, {"user_id": "u2"}, {"user_id": "u1"}, None]
+    repo.get_profiles_by_user_ids.assert_called_once_with(["u1", "u2", "missing"])
+
+
+def test_loader_runs_a_new_batch_per_tick(repo):
+    loader = ProfileBatchLoader()
+
+    async def run():
+        first = await loader.load(repo, "u1")
+        second = await loader.load(repo, "u2")
+        return first, second
+
+    assert asyncio.run(run()) == ({"user_id": "u1"}, {"user_id": "u2"})
+    assert [call.args[0] for call in repo.get_profiles_by_user_ids.call_args_list] == [["u1"], ["u2"]]
+
+
+def test_loader_propagates_query_errors_to_every_waiter(repo):
+    loader = ProfileBatchLoader()
+    repo.get_profiles_by_user_ids.side_effect = RuntimeError("connection lost")
+
+    async def run():
+        return await asyncio.gather(loader.load(repo, "u1"), loader.load(repo, "u2"), return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert repo.get_profiles_by_user_ids.call_count == 1
+
+    # The failed batch leaves no state behind for the next one
+    repo.get_profiles_by_user_ids.side_effect = lambda user_ids: {"u3": {"user_id": "u3"}}
+    assert asyncio.run(loader.load(repo, "u3")) == {"user_id": "u3"}